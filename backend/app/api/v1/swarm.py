@@ -36,5 +36,5 @@ async def detect_anomalies(village_id: str):
         'village': agent.village_name,
         'outbreak_belief': agent.outbreak_belief,
         'risk_level': agent.risk_level,
-        'symptom_count': len(agent.symptom_history)
+        'symptom_count': agent.symptom_history.total_count
     }
@@ -2,16 +2,22 @@
 Updated FastAPI Backend with ADK Integration
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from datetime import datetime
+import asyncio
+import json
 import os
 
 # Import services
-from backend.app.services.edge_ai_service import GeminiEdgeProcessor
-from backend.app.services.quantum_service import QuantumService
+from backend.app.services.edge_ai_service import GeminiEdgeProcessor, StubGenerativeModel
+from backend.app.services.edge_cache import EdgeCache
+from backend.app.services.quantum_service import QuantumService, QuantumQueueFull
+from backend.app.services.quantum_jobs import QuantumJobManager
 
 # ============================================================================
 # Initialize FastAPI
@@ -37,14 +43,44 @@ app.add_middleware(
 # ============================================================================
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "your-api-key")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+# On-disk cache of image analyses; set EDGE_CACHE_PATH="" to disable
+EDGE_CACHE_PATH = os.getenv(
+    "EDGE_CACHE_PATH",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "edge_cache.db"))
+)
+EDGE_CACHE_MB = int(os.getenv("EDGE_CACHE_MB", "64"))
+# Offline stub model when no real key is configured (or GEMINI_OFFLINE=1)
+GEMINI_OFFLINE = os.getenv(
+    "GEMINI_OFFLINE", "1" if GEMINI_API_KEY == "your-api-key" else "0"
+) == "1"
+QUANTUM_BACKEND = os.getenv("QUANTUM_BACKEND", "numpy")  # 'numpy' or 'cirq'
+QUANTUM_WORKERS = int(os.getenv("QUANTUM_WORKERS", "2"))
+QUANTUM_QUEUE_SIZE = int(os.getenv("QUANTUM_QUEUE_SIZE", "16"))
+QUANTUM_CACHE_TTL = float(os.getenv("QUANTUM_CACHE_TTL", "60"))
 
 # Initialize in correct order (quantum first, then swarm with quantum)
-quantum_service = QuantumService()
-gemini_processor = GeminiEdgeProcessor(api_key=GEMINI_API_KEY)
+quantum_service = QuantumService(
+    backend=QUANTUM_BACKEND,
+    max_workers=QUANTUM_WORKERS,
+    max_queue=QUANTUM_QUEUE_SIZE,
+    cache_ttl=QUANTUM_CACHE_TTL
+)
+gemini_processor = GeminiEdgeProcessor(
+    api_key=GEMINI_API_KEY,
+    model=StubGenerativeModel() if GEMINI_OFFLINE else None,
+    max_concurrency=GEMINI_MAX_CONCURRENCY,
+    cache=EdgeCache(EDGE_CACHE_PATH, max_bytes=EDGE_CACHE_MB * 1024 * 1024) if EDGE_CACHE_PATH else None
+)
+if GEMINI_OFFLINE:
+    print("⚠️  Edge AI offline (no GEMINI_API_KEY or GEMINI_OFFLINE=1) - using stub model")
+
+# Background quantum jobs (analyze endpoint + escalations from reports)
+quantum_jobs = QuantumJobManager()
 
 # Import and initialize ADK swarm service with quantum service
 from backend.app.services.adk_swarm_service import ADKSwarmService
-adk_swarm_service = ADKSwarmService(quantum_service=quantum_service)
+adk_swarm_service = ADKSwarmService(quantum_service=quantum_service, quantum_jobs=quantum_jobs)
 
 # ============================================================================
 # Data Models
@@ -56,6 +92,28 @@ class SymptomReportRequest(BaseModel):
     environmental_factors: Optional[List[str]] = []
     vital_signs: Optional[Dict] = {}
 
+# ============================================================================
+# Conditional Responses (ETag / 304)
+# ============================================================================
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names `etag`."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags
+
+def _conditional_json(request: Request, etag: str, build) -> Response:
+    """
+    304 Not Modified when the client is up to date, otherwise the JSON
+    from `build()` tagged with `etag`. `build` is skipped on a 304.
+    """
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(jsonable_encoder(build()), headers=headers)
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -92,7 +150,10 @@ async def health_check():
         "adk_agents": {
             "total": adk_status['total_agents'],
             "active": adk_status['total_agents']
-        }
+        },
+        "edge_ai": gemini_processor.stats(),
+        "quantum_workers": quantum_service.stats(),
+        "quantum_jobs": quantum_jobs.stats()
     }
 
 # ============================================================================
@@ -123,9 +184,11 @@ async def submit_symptom_report(
     print(f"{'='*70}")
     
     # STEP 1: Process with Gemini (Edge AI) - ONLY for voice/image
+    # Voice and image run concurrently; normalization only waits for voice,
+    # whose extracted symptoms it needs.
     edge_analysis = {}
     
-    if voice:
+    async def process_voice():
         try:
             voice_bytes = await voice.read()
             print(f"🎤 Processing voice ({len(voice_bytes)} bytes)...")
@@ -140,7 +203,7 @@ async def submit_symptom_report(
             print(f"❌ Voice processing error: {e}")
             edge_analysis['voice'] = {'error': str(e)}
     
-    if image:
+    async def process_image():
         try:
             image_bytes = await image.read()
             print(f"📷 Processing image ({len(image_bytes)} bytes)...")
@@ -153,12 +216,25 @@ async def submit_symptom_report(
             print(f"❌ Image processing error: {e}")
             edge_analysis['image'] = {'error': str(e)}
     
-    # Normalize symptoms (uses Gemini for translation/normalization)
-    try:
-        normalized = await gemini_processor.normalize_symptoms(symptoms, {})
-        edge_analysis['normalized'] = normalized
-    except Exception as e:
-        edge_analysis['normalized'] = {'error': str(e), 'original': symptoms}
+    async def normalize(voice_done):
+        # Normalize symptoms (uses Gemini for translation/normalization)
+        if voice_done is not None:
+            await voice_done
+        try:
+            normalized = await gemini_processor.normalize_symptoms(symptoms, {})
+            edge_analysis['normalized'] = normalized
+        except Exception as e:
+            edge_analysis['normalized'] = {'error': str(e), 'original': symptoms}
+    
+    voice_task = asyncio.create_task(process_voice()) if voice else None
+    stages = [normalize(voice_task)]
+    if image:
+        stages.append(process_image())
+    await asyncio.gather(*stages)
+    edge_analysis = {
+        stage: edge_analysis[stage]
+        for stage in ('voice', 'image', 'normalized') if stage in edge_analysis
+    }
     
     # STEP 2: Send to Swarm Agent (Rule-based - NO LLM)
     print(f"\n🤖 Sending to Swarm Agent (rule-based)...")
@@ -174,13 +250,17 @@ async def submit_symptom_report(
     print(f"   Outbreak Belief: {adk_result.get('agent_response', {}).get('outbreak_belief', 0)}")
     print(f"   Actions: {adk_result.get('autonomous_actions_taken', [])}")
     
-    # STEP 3: Check if quantum escalation triggered
-    quantum_result = None
-    if 'escalated_to_quantum' in adk_result.get('autonomous_actions_taken', []):
-        print(f"\n⚛️ Quantum analysis triggered...")
-        swarm_data = adk_swarm_service.get_network_status()
-        quantum_result = await quantum_service.detect_outbreak_pattern(swarm_data)
-        print(f"   Outbreak probability: {quantum_result.get('outbreak_probability', 0):.2f}")
+    # STEP 3: Check if quantum escalation triggered. The escalating agent
+    # attaches a result only if one already existed, otherwise the
+    # reference of the background job it queued (never waits for it).
+    agent_response = adk_result.get('agent_response', {})
+    quantum_result = agent_response.get('quantum_analysis')
+    quantum_job = agent_response.get('quantum_job')
+    if quantum_result is not None:
+        print(f"\n⚛️ Quantum analysis (already available): "
+              f"outbreak probability {quantum_result.get('outbreak_probability', 0):.2f}")
+    elif quantum_job is not None:
+        print(f"\n⚛️ Quantum analysis queued: job {quantum_job['job_id']}")
     
     print(f"{'='*70}\n")
     
@@ -189,6 +269,7 @@ async def submit_symptom_report(
         'edge_analysis': edge_analysis,
         'swarm_response': adk_result,
         'quantum_analysis': quantum_result,
+        'quantum_job': quantum_job,
         'workflow': 'rule_based_swarm'
     }
 
@@ -197,9 +278,12 @@ async def submit_symptom_report(
 # ============================================================================
 
 @app.get("/api/v1/swarm/agents")
-async def get_adk_agents():
-    """Get all ADK agents status"""
-    return adk_swarm_service.get_network_status()
+async def get_adk_agents(request: Request):
+    """Get all ADK agents status (supports If-None-Match)"""
+    return _conditional_json(
+        request, adk_swarm_service.status_etag,
+        adk_swarm_service.get_network_status
+    )
 
 @app.get("/api/v1/swarm/agent/{village_id}")
 async def get_adk_agent_status(village_id: str):
@@ -217,7 +301,9 @@ async def trigger_outbreak_workflow(village_id: str):
     Manually trigger the outbreak detection workflow
     All ADK agents will coordinate through the workflow
     """
-    result = await adk_swarm_service.trigger_outbreak_detection_workflow(village_id)
+    result = await _run_quantum(
+        adk_swarm_service.trigger_outbreak_detection_workflow(village_id)
+    )
     
     return {
         'workflow': 'outbreak_detection',
@@ -226,41 +312,116 @@ async def trigger_outbreak_workflow(village_id: str):
     }
 
 @app.get("/api/v1/swarm/network-topology")
-async def get_network_topology():
-    """Get agent network connections"""
-    status = adk_swarm_service.get_network_status()
-    return {
-        'topology': status['network_topology'],
-        'total_agents': status['total_agents']
-    }
+async def get_network_topology(request: Request):
+    """Get agent network connections (supports If-None-Match)"""
+    def build():
+        status = adk_swarm_service.get_network_status()
+        return {
+            'topology': status['network_topology'],
+            'total_agents': status['total_agents']
+        }
+    return _conditional_json(request, adk_swarm_service.status_etag, build)
 
 @app.get("/api/v1/swarm/communications")
-async def get_swarm_communications(limit: int = 50):
-    """Get recent inter-agent communications for visualization"""
+async def get_swarm_communications(limit: int = 50, since: Optional[int] = None):
+    """
+    Get recent inter-agent communications for visualization.
+    Pass `since=<next_cursor>` from a previous response to fetch only new messages.
+    """
+    orchestrator = adk_swarm_service.orchestrator
+    communications = orchestrator.get_communication_log(limit, since)
     return {
-        'communications': adk_swarm_service.orchestrator.get_communication_log(limit),
-        'total_agents': len(adk_swarm_service.orchestrator.agents),
-        'topology': adk_swarm_service.orchestrator.network_topology
+        'communications': communications,
+        'next_cursor': communications[-1]['seq'] if communications else orchestrator.communication_log.last_seq,
+        'total_agents': len(orchestrator.agents),
+        'topology': orchestrator.network_topology
     }
 
+def _format_sse(event_type: str, data: Dict, event_id: Optional[int] = None) -> str:
+    """Encode one Server-Sent Event frame."""
+    frame = f"event: {event_type}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    return frame + f"data: {json.dumps(data, default=str)}\n\n"
+
+@app.get("/api/v1/swarm/stream")
+async def stream_swarm_events(request: Request):
+    """
+    Server-Sent Events stream of swarm activity.
+    
+    Events: `communication` (log entries, id = seq), `agent_update`
+    (belief/risk deltas), `network_update` (batched propagation) and
+    `lagged` (events dropped because this client fell behind - refetch
+    via REST to resync). Reconnecting clients send Last-Event-ID and
+    get missed communications replayed from the ring buffer.
+    """
+    orchestrator = adk_swarm_service.orchestrator
+    last_event_id = request.headers.get('last-event-id')
+    
+    async def event_source():
+        # Subscribe when streaming starts (before replay, so nothing is missed);
+        # a response that is never iterated leaves no subscription behind
+        subscription = orchestrator.events.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            
+            replayed_seq = 0
+            if last_event_id and last_event_id.isdigit():
+                missed = orchestrator.communication_log.since(
+                    int(last_event_id), orchestrator.communication_log.capacity
+                )
+                for entry in missed:
+                    yield _format_sse("communication", entry, entry["seq"])
+                    replayed_seq = entry["seq"]
+            
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                if event["type"] == "communication" and event["id"] <= replayed_seq:
+                    continue  # already sent during replay
+                
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield _format_sse("lagged", {"dropped": dropped})
+                yield _format_sse(event["type"], event["data"], event["id"])
+        finally:
+            orchestrator.events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ============================================================================
 # Quantum Endpoints (unchanged)
 # ============================================================================
 
-@app.post("/api/v1/quantum/analyze")
-async def run_quantum_analysis():
-    """Run quantum analysis on swarm data"""
-    swarm_data = adk_swarm_service.get_network_status()
-    
-    pattern_result = await quantum_service.detect_outbreak_pattern(swarm_data)
-    
+async def _run_quantum(job):
+    """Await a quantum job, mapping pool saturation/timeouts to HTTP errors."""
+    try:
+        return await job
+    except QuantumQueueFull as e:
+        raise HTTPException(503, str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(504, "Quantum analysis timed out")
+
+async def _quantum_analysis(swarm_data) -> Dict:
+    """Pattern detection + resource allocation for one swarm snapshot."""
     villages = [
         {'name': a['name'], 'outbreak_belief': a['outbreak_belief']}
         for a in swarm_data['agents'].values()
     ]
-    allocation = await quantum_service.optimize_resource_allocation(
-        villages=villages,
-        resources={'ors': 1000, 'staff': 50, 'kits': 500}
+    pattern_result, allocation = await asyncio.gather(
+        quantum_service.detect_outbreak_pattern(swarm_data),
+        quantum_service.optimize_resource_allocation(
+            villages=villages,
+            resources={'ors': 1000, 'staff': 50, 'kits': 500}
+        )
     )
     
     return {
@@ -269,11 +430,32 @@ async def run_quantum_analysis():
         'timestamp': datetime.now().isoformat()
     }
 
+@app.post("/api/v1/quantum/analyze", status_code=202)
+async def run_quantum_analysis():
+    """
+    Queue quantum analysis on swarm data. Returns a job ID immediately;
+    repeated submissions for an unchanged swarm share one job.
+    """
+    swarm_data = adk_swarm_service.get_network_status()
+    job, coalesced = quantum_jobs.submit(
+        'analysis', quantum_service.analysis_key(swarm_data),
+        lambda: _quantum_analysis(swarm_data)
+    )
+    return quantum_jobs.summary(job, coalesced)
+
+@app.get("/api/v1/quantum/jobs/{job_id}")
+async def get_quantum_job(job_id: str):
+    """Status and (once completed) result of a quantum job"""
+    job = quantum_jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Quantum job not found")
+    return job
+
 @app.get("/api/v1/quantum/insights")
 async def get_quantum_insights():
     """Get latest quantum insights"""
     swarm_data = adk_swarm_service.get_network_status()
-    return await quantum_service.detect_outbreak_pattern(swarm_data)
+    return await _run_quantum(quantum_service.detect_outbreak_pattern(swarm_data))
 
 # ============================================================================
 # Analytics Endpoints
@@ -281,33 +463,15 @@ async def get_quantum_insights():
 
 @app.get("/api/v1/analytics/dashboard")
 async def get_dashboard_stats():
-    """Get dashboard statistics with ADK metrics"""
-    swarm_status = adk_swarm_service.get_network_status()
-    
-    total_reports = sum(
-        a['symptom_count'] for a in swarm_status['agents'].values()
-    )
-    
-    high_risk_villages = sum(
-        1 for a in swarm_status['agents'].values()
-        if a['risk_level'] in ['high', 'critical']
-    )
-    
-    avg_belief = sum(
-        a['outbreak_belief'] for a in swarm_status['agents'].values()
-    ) / len(swarm_status['agents']) if swarm_status['agents'] else 0
-    
+    """Get dashboard statistics with ADK metrics (streaming aggregates, O(1))"""
     return {
-        'active_villages': swarm_status['total_agents'],
-        'total_reports': total_reports,
-        'high_risk_villages': high_risk_villages,
-        'average_outbreak_belief': avg_belief,
+        **adk_swarm_service.orchestrator.metrics.snapshot(),
         'system_status': 'operational',
         'framework': 'ADK Multi-Agent System'
     }
 
 # ============================================================================
-# Startup Event
+# Startup / Shutdown Events
 # ============================================================================
 
 @app.on_event("startup")
@@ -335,10 +499,16 @@ async def startup_event():
     print("API docs at http://localhost:8000/docs")
     print("="*70 + "\n")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop quantum worker pool and edge AI threads"""
+    quantum_service.shutdown()
+    gemini_processor.shutdown()
+
 # ============================================================================
 # Run Server
 # ============================================================================
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -13,9 +13,13 @@ class ADKSwarmService:
     Integrates with FastAPI backend
     """
     
-    def __init__(self, quantum_service=None):
-        # Initialize orchestrator with quantum service
-        self.orchestrator = SwarmOrchestrator(quantum_service=quantum_service)
+    def __init__(self, quantum_service=None, vectorized: bool = None, quantum_jobs=None):
+        # Initialize orchestrator with quantum service (escalations queue on quantum_jobs)
+        self.orchestrator = SwarmOrchestrator(
+            quantum_service=quantum_service,
+            vectorized=vectorized,
+            quantum_jobs=quantum_jobs
+        )
         
         print(f"✓ ADK Swarm Service initialized: {len(self.orchestrator.agents)} agents")
     
@@ -32,10 +36,22 @@ class ADKSwarmService:
         
         return result
     
+    async def trigger_outbreak_detection_workflow(self, village_id: str) -> Dict:
+        """
+        Run the swarm-wide outbreak detection workflow
+        (quantum analysis goes through the shared, deduplicated QuantumService)
+        """
+        return await self.orchestrator.trigger_outbreak_detection_workflow(village_id)
+    
     def get_network_status(self) -> Dict:
-        """Get status of ADK swarm network"""
+        """Get status of ADK swarm network (cached read-only snapshot)"""
         return self.orchestrator.get_network_status()
     
+    @property
+    def status_etag(self) -> str:
+        """ETag of the current network status version"""
+        return self.orchestrator.status_etag
+    
     def get_agent_status(self, village_id: str) -> Dict:
         """Get specific agent status"""
         agent = self.orchestrator.get_agent(village_id)
@@ -49,7 +65,7 @@ class ADKSwarmService:
             'location': agent.location,
             'outbreak_belief': agent.outbreak_belief,
             'risk_level': agent.risk_level,
-            'symptom_count': len(agent.symptom_history),
+            'symptom_count': agent.symptom_history.total_count,
             'neighbors': self.orchestrator.network_topology.get(agent.village_id, []),
             'adk_agent_status': 'active'
         }
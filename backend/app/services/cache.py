@@ -0,0 +1,123 @@
+"""
+Caching Helpers
+
+- SingleFlight: concurrent async calls with the same key share one
+  in-flight computation instead of each running it.
+- LRUCache: bounded key -> value store with least-recently-used eviction.
+- TTLCache: LRUCache whose entries also expire after `ttl` seconds,
+  with hit/miss counters.
+
+All are meant for use from the event loop thread.
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import time
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent async calls by key.
+
+    The computation runs in its own task that every caller awaits through
+    asyncio.shield, so cancelling one caller (even the one that started
+    it) never cancels the work the others are waiting on.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.shared: int = 0  # calls that joined an existing flight
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable]) -> Any:
+        """Await fn() - or the identical call already running for `key`."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved in case every caller went away
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """LRU cache with per-entry expiry and hit/miss statistics."""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.clock = clock
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_with_age(self, key: Hashable, count_miss: bool = True) -> Optional[Tuple[Any, float]]:
+        """
+        (value, age in seconds) for a fresh entry, else None.
+        count_miss=False is for a peek whose miss is followed by a counted
+        lookup of the same key.
+        """
+        entry = super().get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = self.clock() - stored_at
+            if age <= self.ttl:
+                self.hits += 1
+                return value, age
+            del self._data[key]
+        self.misses += count_miss
+        return None
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        found = self.get_with_age(key)
+        return found[0] if found else default
+
+    def set(self, key: Hashable, value: Any):
+        super().set(key, (value, self.clock()))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None
+        }
@@ -1,21 +1,240 @@
 """
 Edge AI Service using Gemini API
 Processes voice, images, and normalizes symptoms
+
+Model calls never block the event loop: they use the async client
+(generate_content_async) or, for models without one, a bounded thread
+pool. Concurrency is capped by a semaphore, each call has a timeout, and
+transient failures are retried with jittered exponential backoff
+(`tools.timeout` / `tools.retry_attempts` in adk_config.yaml).
+StubGenerativeModel stands in for Gemini when running offline.
+
+Symptom normalization is local-first (symptom_lexicon.py): Gemini only
+sees the terms the lexicon cannot resolve, batched into one prompt.
+Image analyses are cached by media content (edge_cache.py); cache I/O
+runs in a worker thread.
+Normalization results are memoized per symptom set and context, and
+concurrent identical requests share one computation.
 """
 
 import google.generativeai as genai
-from typing import List, Dict, Optional
+from google.api_core import exceptions as google_exceptions
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+import asyncio
 import base64
+import copy
+import hashlib
 import io
+import json
+import random
+import time
+
+from backend.app.services.cache import SingleFlight, TTLCache
+from backend.app.services.edge_cache import EdgeCache
+from backend.app.services.symptom_lexicon import SymptomLexicon, normalize_key, symptom_lexicon
+from swarm.utils.config_loader import get_adk_setting
+
+# Errors that will not go away on retry (bad key, bad request, ...)
+NON_RETRYABLE_ERRORS = (
+    google_exceptions.InvalidArgument,
+    google_exceptions.PermissionDenied,
+    google_exceptions.Unauthenticated,
+    google_exceptions.NotFound,
+    ValueError,
+    TypeError
+)
+
+RETRY_BASE_DELAY = 0.5  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 8.0
+
+NORMALIZE_CACHE_SIZE = 1024  # distinct (symptom set, context) results kept
+NORMALIZE_CACHE_TTL = 3600.0  # seconds
+
+
+class StubResponse:
+    """Minimal stand-in for a Gemini response (only .text is used)"""
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGenerativeModel:
+    """
+    Offline replacement for genai.GenerativeModel
+    
+    Returns `response_text` (an empty, valid analysis by default) after
+    `latency` seconds. The first `failures` calls raise ServiceUnavailable
+    so retry handling can be exercised without network access.
+    """
+    
+    def __init__(self, response_text: str = None, latency: float = 0.0, failures: int = 0):
+        self.response_text = response_text or json.dumps({
+            'detected_conditions': [],
+            'severity': 'none',
+            'confidence': 0.0,
+            'description': 'Offline stub model - no analysis performed',
+            'recommendations': []
+        })
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+    
+    def _respond(self) -> StubResponse:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise google_exceptions.ServiceUnavailable("Stub model failure")
+        return StubResponse(self.response_text)
+    
+    def generate_content(self, contents) -> StubResponse:
+        time.sleep(self.latency)
+        return self._respond()
+    
+    async def generate_content_async(self, contents) -> StubResponse:
+        await asyncio.sleep(self.latency)
+        return self._respond()
+
 
 class GeminiEdgeProcessor:
     """
     Gemini-powered edge AI for symptom processing
+    
+    model: model instance to use instead of gemini-1.5-pro (e.g. StubGenerativeModel)
+    max_concurrency: Gemini calls allowed in flight at once
+    timeout / retry_attempts: per-call timeout in seconds and retries after
+        the first attempt (default: tools.timeout / tools.retry_attempts)
+    lexicon: local symptom lexicon tried before Gemini (see symptom_lexicon.py)
+    cache: on-disk cache of image analyses (see edge_cache.py)
+    normalize_cache_size / normalize_cache_ttl: memoized normalize_symptoms results
     """
     
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-pro')
+    def __init__(self, api_key: str, model=None, max_concurrency: int = 4,
+                 timeout: float = None, retry_attempts: int = None,
+                 lexicon: SymptomLexicon = None, cache: EdgeCache = None,
+                 normalize_cache_size: int = NORMALIZE_CACHE_SIZE,
+                 normalize_cache_ttl: float = NORMALIZE_CACHE_TTL):
+        if model is None:
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel('gemini-1.5-pro')
+        self.model = model
+        self.lexicon = lexicon or symptom_lexicon
+        self.cache = cache
+        self.model_name = getattr(model, 'model_name', type(model).__name__)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout or get_adk_setting('tools.timeout', 30)
+        self.retry_attempts = (
+            retry_attempts if retry_attempts is not None
+            else get_adk_setting('tools.retry_attempts', 3)
+        )
+        
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = None  # only for models without an async API
+        self._in_flight = 0
+        self._counts = {'calls': 0, 'retries': 0, 'timeouts': 0, 'failed': 0}
+        
+        # Memoized normalization (one computation per symptom set in flight)
+        self._normalize_cache = TTLCache(maxsize=normalize_cache_size, ttl=normalize_cache_ttl)
+        self._normalize_flight = SingleFlight()
+    
+    # ========================================================================
+    # MODEL CALLS
+    # ========================================================================
+    
+    async def _call_model(self, contents):
+        """One model call without blocking the event loop"""
+        if hasattr(self.model, 'generate_content_async'):
+            return await self.model.generate_content_async(contents)
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix='gemini'
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.model.generate_content, contents)
+    
+    async def _generate(self, contents):
+        """
+        Model call with concurrency limit, timeout and jittered retries
+        """
+        self._counts['calls'] += 1
+        attempts = 1 + max(0, int(self.retry_attempts))
+        
+        for attempt in range(attempts):
+            try:
+                async with self._semaphore:
+                    self._in_flight += 1
+                    try:
+                        return await asyncio.wait_for(self._call_model(contents), timeout=self.timeout)
+                    finally:
+                        self._in_flight -= 1
+            except NON_RETRYABLE_ERRORS:
+                self._counts['failed'] += 1
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self._counts['timeouts'] += 1
+                if attempt == attempts - 1:
+                    self._counts['failed'] += 1
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise asyncio.TimeoutError(
+                            f"Gemini call timed out after {self.timeout}s ({attempts} attempts)"
+                        ) from e
+                    raise
+                
+                # Full backoff window with +/-50% jitter so retries spread out
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.5)
+                self._counts['retries'] += 1
+                print(f"⚠️  Gemini call failed ({type(e).__name__}), "
+                      f"retry {attempt + 1}/{attempts - 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    def stats(self) -> Dict:
+        """Call counters for /health"""
+        return {
+            'model': type(self.model).__name__,
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self._in_flight,
+            'timeout': self.timeout,
+            'retry_attempts': self.retry_attempts,
+            **self._counts,
+            'cache': self.cache.stats() if self.cache else None,
+            'normalize_cache': {
+                **self._normalize_cache.stats(),
+                'single_flight_shared': self._normalize_flight.shared
+            }
+        }
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.cache is not None:
+            self.cache.close()
+    
+    async def _cached_analysis(self, kind: str, data: bytes, perceptual: bool = False) -> Optional[Dict]:
+        """Cached result for this media (per model), marked with how it matched"""
+        if self.cache is None:
+            return None
+        # SQLite lookup and image hashing stay off the event loop
+        hit = await asyncio.to_thread(
+            self.cache.get, f"{kind}:{self.model_name}", data, perceptual
+        )
+        if hit is None:
+            return None
+        result, match = hit
+        print(f"💾 {kind.capitalize()} analysis served from cache ({match} match)")
+        return {**result, 'cached': True, 'cache_match': match}
+    
+    async def _store_analysis(self, kind: str, data: bytes, result: Dict, perceptual: bool = False):
+        if self.cache is not None:
+            await asyncio.to_thread(
+                self.cache.set, f"{kind}:{self.model_name}", data, result, perceptual
+            )
+    
+    # ========================================================================
+    # PROCESSING
+    # ========================================================================
     
     async def process_voice(self, audio_bytes: bytes) -> Dict:
         """
@@ -34,7 +253,7 @@ Extract:
 Return as JSON with keys: symptoms_extracted, severity, duration, environmental_factors"""
 
             # For now, simulate since audio processing requires specific setup
-            # In production, you'd use: response = self.model.generate_content([prompt, audio_bytes])
+            # In production, you'd use: response = await self._generate([prompt, audio_bytes])
             
             return {
                 'symptoms_extracted': ['fever', 'headache', 'body_pain'],
@@ -55,7 +274,13 @@ Return as JSON with keys: symptoms_extracted, severity, duration, environmental_
     async def process_image(self, image_bytes: bytes) -> Dict:
         """
         Process image (rash, symptoms) using Gemini Vision
+        
+        Re-uploads and near-identical photos are answered from the cache.
         """
+        cached = await self._cached_analysis('image', image_bytes, perceptual=True)
+        if cached is not None:
+            return cached
+        
         try:
             from PIL import Image
             import base64
@@ -117,7 +342,7 @@ If you cannot identify any medical conditions, return:
 }"""
 
             # Call Gemini Vision
-            response = self.model.generate_content([prompt, image])
+            response = await self._generate([prompt, image])
             
             # Parse the response
             result = self._parse_json_response(response.text)
@@ -126,7 +351,9 @@ If you cannot identify any medical conditions, return:
             
             print(f"📷 Gemini Vision Analysis: {result.get('detected_conditions', [])}")
             
-            return result
+            await self._store_analysis('image', image_bytes, result, perceptual=True)
+            
+            return {**result, 'cached': False}
         
         except Exception as e:
             import traceback
@@ -143,7 +370,6 @@ If you cannot identify any medical conditions, return:
     
     def _parse_json_response(self, text: str) -> Dict:
         """Parse JSON from Gemini response"""
-        import json
         try:
             # Remove markdown code blocks if present
             text = text.strip()
@@ -166,68 +392,124 @@ If you cannot identify any medical conditions, return:
                 'recommendations': []
             }
     
+    @staticmethod
+    def _normalize_key(symptoms: List[str], context: Dict) -> Tuple:
+        """Memo key: sorted, lowercased symptoms plus a hash of the context"""
+        terms = tuple(sorted(' '.join(s.lower().split()) for s in symptoms))
+        context_hash = hashlib.sha256(
+            json.dumps(context or {}, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return terms, context_hash
+    
     async def normalize_symptoms(self, symptoms: List[str], context: Dict) -> Dict:
         """
-        Normalize and categorize symptoms using Gemini
-        """
-        try:
-            prompt = f"""Normalize these symptom descriptions: {symptoms}
-
-Context: {context}
-
-Tasks:
-1. Map to standard medical terms
-2. Categorize by system (respiratory, gastrointestinal, etc.)
-3. Identify disease patterns
-4. Assess urgency
-
-Return as JSON."""
-
-            response = self.model.generate_content(prompt)
-            
-            # Simplified normalization
-            normalized = {
-                'original': symptoms,
-                'normalized': self._simple_normalize(symptoms),
-                'categories': self._categorize_symptoms(symptoms),
-                'urgency': self._assess_urgency(symptoms),
-                'gemini_analysis': response.text
-            }
-            
-            return normalized
+        Normalize and categorize symptoms
         
-        except Exception as e:
+        Tier 1: local lexicon (exact, phrase and fuzzy matches) - no LLM call
+        Tier 2: only terms the lexicon cannot resolve go to Gemini, batched
+        into a single prompt
+        
+        Results are memoized per symptom set and context (in any order or
+        case); a burst of identical requests shares one computation.
+        """
+        key = self._normalize_key(symptoms, context)
+        hit = self._normalize_cache.get_with_age(key)
+        if hit is not None:
+            result, age = hit
             return {
-                'original': symptoms,
-                'normalized': symptoms,
-                'error': str(e)
+                **copy.deepcopy(result), 'original': symptoms, 'llm_calls': 0,
+                'cached': True, 'cache_age': round(age, 3)
             }
+        
+        async def compute():
+            result = await self._normalize_uncached(list(symptoms), context)
+            # Failed Gemini calls are not remembered, the next report retries
+            if 'error' not in result:
+                self._normalize_cache.set(key, result)
+            return result
+        
+        result = await self._normalize_flight.run(key, compute)
+        return {**copy.deepcopy(result), 'original': symptoms, 'cached': False, 'cache_age': 0.0}
     
-    def _simple_normalize(self, symptoms: List[str]) -> List[str]:
-        """Simple symptom normalization"""
-        normalization_map = {
-            'high fever': 'fever',
-            'temperature': 'fever',
-            'bukhar': 'fever',
-            'headache': 'headache',
-            'sir dard': 'headache',
-            'vomiting': 'vomiting',
-            'ulti': 'vomiting',
-            'diarrhea': 'diarrhea',
-            'loose motion': 'diarrhea',
-            'body pain': 'body_pain',
-            'badan dard': 'body_pain',
-            'rash': 'rash',
-            'cough': 'cough',
-            'khansi': 'cough'
-        }
+    async def _normalize_uncached(self, symptoms: List[str], context: Dict) -> Dict:
+        resolved, unresolved = self.lexicon.resolve_all(symptoms)
+        
+        gemini_terms, gemini_analysis, error = {}, None, None
+        if unresolved:
+            try:
+                gemini_terms, gemini_analysis = await self._normalize_with_gemini(
+                    unresolved, context
+                )
+            except Exception as e:
+                # Lexicon matches still stand; unresolved terms pass through
+                error = str(e)
         
         normalized = []
         for symptom in symptoms:
-            symptom_lower = symptom.lower().strip()
-            normalized.append(normalization_map.get(symptom_lower, symptom_lower))
+            if symptom in resolved:
+                normalized += resolved[symptom]  # empty for negated terms
+            else:
+                normalized += gemini_terms.get(symptom) or [symptom.lower().strip()]
+        normalized = list(dict.fromkeys(normalized))  # Remove duplicates
+        
+        # Categories / urgency from the canonical names, so every language counts
+        result = {
+            'original': symptoms,
+            'categories': self._categorize_symptoms(normalized),
+            'urgency': self._assess_urgency(normalized),
+            'gemini_analysis': gemini_analysis
+        }
+        if error is not None:
+            result['error'] = error
+        result['normalized'] = normalized
+        result['resolved_by'] = {
+            'lexicon': len(resolved),
+            'gemini': len(gemini_terms),
+            'unresolved': len(unresolved) - len(gemini_terms)
+        }
+        result['llm_calls'] = 1 if unresolved else 0
+        
+        return result
+    
+    async def _normalize_with_gemini(self, terms: List[str], context: Dict):
+        """
+        One Gemini call for all terms the lexicon could not resolve.
+        Returns (term -> canonical symptoms, raw response text).
+        """
+        known = ', '.join(sorted(self.lexicon.canonical_terms))
+        prompt = f"""Normalize these symptom descriptions reported by a community health worker
+(they may be in Hindi, Marathi or English, possibly misspelled): {terms}
+
+Context: {context}
+
+Map each description to one or more standard symptom names in snake_case,
+preferring these when they fit: {known}
+
+Return only a JSON object mapping each description exactly as given to a
+list of symptom names, e.g. {{"description": ["symptom_name"]}}"""
+
+        response = await self._generate(prompt)
+        answer = self._parse_json_response(response.text)
+        if not isinstance(answer, dict):
+            answer = {}
+        
+        mapped = {}
+        for term in terms:
+            names = answer.get(term)
+            if isinstance(names, str):
+                names = [names]
+            if not isinstance(names, list):
+                continue
+            canonical = []
+            for name in names:
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                matches, _ = self.lexicon.resolve(name)
+                canonical += matches or [normalize_key(name).replace(' ', '_')]
+            if canonical:
+                mapped[term] = list(dict.fromkeys(canonical))
         
-        return list(set(normalized))  # Remove duplicates
+        return mapped, response.text
     
     def _categorize_symptoms(self, symptoms: List[str]) -> Dict:
         """Categorize symptoms by body system"""
@@ -241,11 +523,11 @@ Return as JSON."""
         
         for symptom in symptoms:
             s = symptom.lower()
-            if any(x in s for x in ['cough', 'breathing', 'respiratory']):
+            if any(x in s for x in ['cough', 'breathing', 'respiratory', 'throat', 'nose']):
                 categories['respiratory'].append(symptom)
             elif any(x in s for x in ['vomit', 'diarrhea', 'nausea', 'stomach']):
                 categories['gastrointestinal'].append(symptom)
-            elif any(x in s for x in ['headache', 'dizzy', 'confusion']):
+            elif any(x in s for x in ['headache', 'dizz', 'confusion', 'seizure']):
                 categories['neurological'].append(symptom)
             elif any(x in s for x in ['rash', 'skin', 'lesion']):
                 categories['dermatological'].append(symptom)
@@ -0,0 +1,191 @@
+"""
+Edge Analysis Cache (content-addressed, on disk)
+
+Gemini image analyses keyed by the SHA-256 of the media bytes, stored
+in SQLite so they survive restarts:
+- exact re-uploads are answered without calling the model
+- near-identical photos can match by perceptual hash (64-bit dHash,
+  Hamming distance <= max_distance; needs Pillow)
+- total stored size is capped, least recently used entries go first
+- hits / misses are counted for /health
+
+Calls block on disk I/O (and image decoding for the perceptual hash);
+async callers should run them in a worker thread.
+"""
+
+from typing import Dict, Optional, Tuple
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISTANCE = 4  # differing dHash bits still treated as the same photo
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def perceptual_hash(data: bytes) -> Optional[int]:
+    """
+    64-bit difference hash (dHash) of an image, or None if Pillow is
+    missing or the bytes are not a readable image.
+    """
+    try:
+        from PIL import Image
+        image = Image.open(io.BytesIO(data)).convert('L').resize((9, 8))
+    except Exception:
+        return None
+
+    pixels = list(image.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+class EdgeCache:
+    """
+    SQLite-backed LRU cache of edge analysis results
+
+    kind: namespace for the analysis (e.g. 'image:<model>'), so results
+        from different prompts / models never mix
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self._counts = {'hits': 0, 'near_hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                phash TEXT,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (kind, digest)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+        self._db.commit()
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    # ========================================================================
+    # LOOKUP / STORE
+    # ========================================================================
+
+    def get(self, kind: str, data: bytes, perceptual: bool = False) -> Optional[Tuple[Dict, str]]:
+        """
+        (cached result, 'exact' | 'perceptual') for these media bytes, or
+        None. `perceptual` also accepts near-duplicate images.
+        """
+        digest = content_hash(data)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, value FROM entries WHERE kind = ? AND digest = ?", (kind, digest)
+            ).fetchone()
+            match = 'exact'
+
+            if row is None and perceptual:
+                digest = self._nearest(kind, perceptual_hash(data))
+                if digest is not None:
+                    row = self._db.execute(
+                        "SELECT digest, value FROM entries WHERE kind = ? AND digest = ?",
+                        (kind, digest)
+                    ).fetchone()
+                match = 'perceptual'
+
+            if row is None:
+                self._counts['misses'] += 1
+                return None
+
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE kind = ? AND digest = ?",
+                (time.time(), kind, row[0])
+            )
+            self._db.commit()
+            self._counts['hits' if match == 'exact' else 'near_hits'] += 1
+            return json.loads(row[1]), match
+
+    def _nearest(self, kind: str, phash: Optional[int]) -> Optional[str]:
+        """Digest of the closest stored image within max_distance bits (linear scan)"""
+        if phash is None:
+            return None
+        best, best_distance = None, self.max_distance + 1
+        # Hashes only - the stored value is fetched for the winner alone
+        rows = self._db.execute(
+            "SELECT digest, phash FROM entries WHERE kind = ? AND phash IS NOT NULL", (kind,)
+        )
+        for digest, stored in rows:
+            distance = bin(phash ^ int(stored, 16)).count('1')
+            if distance < best_distance:
+                best, best_distance = digest, distance
+        return best
+
+    def set(self, kind: str, data: bytes, result: Dict, perceptual: bool = False):
+        """Store a result for these media bytes, evicting LRU entries over max_bytes"""
+        value = json.dumps(result, default=str)
+        digest = content_hash(data)
+        phash = perceptual_hash(data) if perceptual else None
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT size FROM entries WHERE kind = ? AND digest = ?", (kind, digest)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, digest, None if phash is None else f"{phash:016x}",
+                 value, len(value), now, now)
+            )
+            self._size += len(value) - (previous[0] if previous else 0)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            row = self._db.execute(
+                "SELECT kind, digest, size FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM entries WHERE kind = ? AND digest = ?", row[:2])
+            self._size -= row[2]
+            self._counts['evictions'] += 1
+
+    # ========================================================================
+    # METRICS
+    # ========================================================================
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self._counts['hits'] + self._counts['near_hits'] + self._counts['misses']
+        hits = self._counts['hits'] + self._counts['near_hits']
+        return {
+            'entries': entries,
+            'bytes': self._size,
+            'max_bytes': self.max_bytes,
+            **self._counts,
+            'hit_rate': round(hits / lookups, 3) if lookups else None
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,112 @@
+"""
+Quantum Job Manager
+
+Runs quantum analyses as background jobs so HTTP requests (and ASHA
+report submissions) return immediately with a job ID:
+- submit() schedules the work and returns the job record at once
+- results are kept (bounded) and fetched via get() / the jobs endpoint
+- a submission for the same (kind, swarm snapshot) as a queued, running
+  or completed job returns that job instead of starting a new one; the
+  snapshot key is QuantumService.analysis_key, so jobs coalesce exactly
+  when the analysis result cache would hit
+
+Must be used from the event loop thread.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import uuid
+
+DEFAULT_MAX_JOBS = 256
+
+QUEUED, RUNNING, COMPLETED, FAILED = 'queued', 'running', 'completed', 'failed'
+
+
+class QuantumJobManager:
+    """Background quantum jobs with snapshot-keyed coalescing."""
+
+    def __init__(self, max_jobs: int = DEFAULT_MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._by_key: Dict[Tuple[str, str], str] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.coalesced: int = 0
+
+    def submit(self, kind: str, snapshot_key: str,
+               run: Callable[[], Awaitable]) -> Tuple[Dict, bool]:
+        """
+        Schedule `run()` as a job. Returns (job, coalesced) where
+        `coalesced` is True if an equivalent job already existed.
+        """
+        existing = self._jobs.get(self._by_key.get((kind, snapshot_key)))
+        if existing is not None and existing['status'] != FAILED:
+            self.coalesced += 1
+            return existing, True
+
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'kind': kind,
+            'status': QUEUED,
+            'snapshot': snapshot_key,
+            'submitted_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None
+        }
+        self._jobs[job_id] = job
+        self._by_key[(kind, snapshot_key)] = job_id
+        self._tasks[job_id] = asyncio.create_task(self._execute(job, run))
+        self._evict()
+        return job, False
+
+    async def _execute(self, job: Dict, run: Callable[[], Awaitable]):
+        job['status'] = RUNNING
+        job['started_at'] = datetime.now().isoformat()
+        try:
+            job['result'] = await run()
+            job['status'] = COMPLETED
+        except Exception as e:
+            job['error'] = str(e) or type(e).__name__
+            job['status'] = FAILED
+        finally:
+            job['finished_at'] = datetime.now().isoformat()
+            self._tasks.pop(job['job_id'], None)
+            self._evict()
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond max_jobs."""
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            job = self._jobs[job_id]
+            if job['status'] in (COMPLETED, FAILED):
+                del self._jobs[job_id]
+                key = (job['kind'], job['snapshot'])
+                if self._by_key.get(key) == job_id:
+                    del self._by_key[key]
+                excess -= 1
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self._jobs.get(job_id)
+
+    @staticmethod
+    def summary(job: Dict, coalesced: bool = False) -> Dict:
+        """Job reference returned to clients (poll `status_url` for the result)."""
+        return {
+            'job_id': job['job_id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'coalesced': coalesced,
+            'status_url': f"/api/v1/quantum/jobs/{job['job_id']}"
+        }
+
+    def stats(self) -> Dict:
+        counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+        for job in self._jobs.values():
+            counts[job['status']] += 1
+        return {**counts, 'stored': len(self._jobs), 'coalesced': self.coalesced}
@@ -1,29 +1,257 @@
+"""
+Quantum Service (worker pool)
+
+Quantum simulations are CPU-bound, so they run on a dedicated executor
+instead of the FastAPI event loop:
+- Cirq backend: ProcessPoolExecutor (one CirqQuantumService per worker)
+- NumPy backend: ThreadPoolExecutor (NumPy releases the GIL in its kernels)
+
+Jobs beyond `max_queue` are rejected with QuantumQueueFull, each job has
+a timeout, and queue depth / latency are reported by stats().
+
+Outbreak analyses are keyed by a content hash of the quantized agent
+beliefs and symptom breakdowns: concurrent requests for the same
+snapshot share one job (single-flight) and repeated ones are answered
+from a TTL + LRU result cache. Results carry `cached` and `cache_age`
+and are private copies (callers may modify them).
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+import asyncio
+import copy
+import hashlib
+import json
+import math
+import time
+
+from backend.app.services.cache import SingleFlight, TTLCache
 from quantum.cirq_integration import QuantumService as CirqQuantumService
-from typing import Dict, List
+from swarm.utils.config_loader import get_adk_setting
+
+LATENCY_WINDOW = 100  # jobs kept for latency stats
+RESULT_CACHE_SIZE = 32  # analyses kept, one per swarm snapshot
+RESULT_CACHE_TTL = 60.0  # seconds before a cached analysis is recomputed
+BELIEF_QUANTUM = 0.01  # beliefs closer than this share a cache entry
+
+
+class QuantumQueueFull(RuntimeError):
+    """Raised when the quantum job queue is at capacity."""
+
+
+# ============================================================================
+# Worker-side job functions (module level so they can be pickled)
+# ============================================================================
+
+_worker_service: CirqQuantumService = None
+
+
+def _init_worker(backend: str):
+    """Process pool initializer: one simulator service per worker process."""
+    global _worker_service
+    _worker_service = CirqQuantumService(backend=backend)
+
+
+def _analyze_job(swarm_data: Dict, service: CirqQuantumService = None) -> Dict:
+    service = service or _worker_service
+    return asyncio.run(service.analyze_outbreak_pattern(swarm_data))
+
+
+def _optimize_job(villages: List[Dict], resources: Dict,
+                  service: CirqQuantumService = None) -> List[Dict]:
+    service = service or _worker_service
+    return asyncio.run(service.optimize_resource_allocation(villages, resources))
+
+
+def _to_plain(value):
+    """Copy read-only snapshots (MappingProxyType, tuples) into plain dicts/lists."""
+    if isinstance(value, Mapping):
+        return {k: _to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(v) for v in value]
+    return value
+
+
+def snapshot_key(swarm_data: Dict, breakdown=None,
+                 belief_quantum: float = BELIEF_QUANTUM) -> str:
+    """
+    Content hash of the agent fields the outbreak analysis reads.
+
+    Beliefs are rounded to `belief_quantum`; `breakdown(agent)` maps an
+    agent to its symptom breakdown (defaults to the raw symptom_count).
+    """
+    agents = swarm_data.get('agents', {}) if swarm_data else {}
+    content = sorted(
+        (
+            aid,
+            a.get('name'),
+            round((a.get('outbreak_belief') or 0.0) / belief_quantum),
+            breakdown(a) if breakdown else a.get('symptom_count')
+        )
+        for aid, a in agents.items()
+    )
+    return hashlib.sha256(
+        json.dumps(content, default=str, sort_keys=True).encode()
+    ).hexdigest()
+
 
 class QuantumService:
     """
     Quantum service wrapper using Cirq
+
+    backend: simulator backend name ('cirq' or 'numpy'), see quantum/simulators.py
     """
-    
-    def __init__(self):
-        self.cirq_service = CirqQuantumService()
-    
+
+    def __init__(self, backend: str = 'numpy', max_workers: int = 2,
+                 max_queue: int = 16, job_timeout: float = None,
+                 cache_ttl: float = RESULT_CACHE_TTL,
+                 cache_size: int = RESULT_CACHE_SIZE):
+        self.backend = backend or 'numpy'
+        self.cirq_service = CirqQuantumService(backend=self.backend)
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout or get_adk_setting('tools.timeout', 30)
+
+        # Process pool for Cirq, threads for the NumPy engine (created lazily)
+        self.use_processes = self.backend == 'cirq'
+        self._executor = None
+
+        # Metrics
+        self._in_flight = 0
+        self._latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        self._counts = {'completed': 0, 'failed': 0, 'timeouts': 0, 'rejected': 0}
+        
+        # Snapshot-keyed deduplication of outbreak analyses
+        self._analysis_flight = SingleFlight()
+        self._analysis_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker, initargs=(self.backend,)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='quantum'
+                )
+        return self._executor
+
+    async def _submit(self, job, *args):
+        """Run a job on the worker pool with admission control and a timeout."""
+        if self._in_flight >= self.max_queue:
+            self._counts['rejected'] += 1
+            raise QuantumQueueFull(f"Quantum queue full ({self.max_queue} jobs)")
+
+        if not self.use_processes:
+            args = args + (self.cirq_service,)
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        # A job counts against the queue until the worker is done with it,
+        # even if its caller has already timed out
+        future = self._get_executor().submit(job, *args)
+        self._in_flight += 1
+        future.add_done_callback(lambda _: self._job_finished(loop))
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.job_timeout)
+        except asyncio.TimeoutError:
+            # Queued jobs are dropped; a job already running finishes in the
+            # background and its result is discarded
+            future.cancel()
+            self._counts['timeouts'] += 1
+            raise
+        except Exception:
+            self._counts['failed'] += 1
+            raise
+
+        self._counts['completed'] += 1
+        self._latencies_ms.append((time.perf_counter() - started) * 1000)
+        return result
+
+    def _job_finished(self, loop: asyncio.AbstractEventLoop):
+        """Executor done-callback (may run on a worker thread)."""
+        def release():
+            self._in_flight -= 1
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            pass  # event loop already closed
+
     async def analyze_outbreak_pattern(self, swarm_data: Dict) -> Dict:
         """
         Called when swarm reaches consensus
         Uses quantum circuits to amplify weak patterns
+        
+        Identical snapshots are analyzed once (see snapshot_key) and
+        reused for cache_ttl seconds.
+        """
+        key = self.analysis_key(swarm_data)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        
+        async def analyze():
+            result = await self._submit(_analyze_job, _to_plain(swarm_data))
+            self._analysis_cache.set(key, result)
+            return result
+        
+        result = await self._analysis_flight.run(key, analyze)
+        return {**copy.deepcopy(result), 'cached': False, 'cache_age': 0.0}
+
+    def cached_analysis(self, swarm_data: Dict) -> Optional[Dict]:
+        """
+        Fresh cached analysis of this snapshot, without running one (None
+        on miss). A miss is not counted - the queued job's lookup will be.
         """
-        return await self.cirq_service.analyze_outbreak_pattern(swarm_data)
-    
+        return self._cached(self.analysis_key(swarm_data), count_miss=False)
+
+    def _cached(self, key: str, count_miss: bool = True) -> Optional[Dict]:
+        hit = self._analysis_cache.get_with_age(key, count_miss=count_miss)
+        if hit is None:
+            return None
+        result, age = hit
+        return {**copy.deepcopy(result), 'cached': True, 'cache_age': round(age, 3)}
+
+    def analysis_key(self, swarm_data: Dict) -> str:
+        """Cache key for an outbreak analysis of this swarm snapshot."""
+        return snapshot_key(swarm_data, breakdown=self.cirq_service._get_symptom_breakdown)
+
     async def detect_outbreak_pattern(self, swarm_data: Dict) -> Dict:
         """Alias for analyze_outbreak_pattern"""
         return await self.analyze_outbreak_pattern(swarm_data)
-    
+
     async def optimize_resource_allocation(self, villages: List[Dict], resources: Dict) -> List[Dict]:
         """
         Optimize resource allocation using quantum-inspired algorithm
         """
-        return await self.cirq_service.optimize_resource_allocation(villages, resources)
+        return await self._submit(_optimize_job, _to_plain(villages), dict(resources))
+
+    def stats(self) -> Dict:
+        """Queue depth and latency metrics for /health."""
+        latencies = sorted(self._latencies_ms)
+        return {
+            'backend': self.backend,
+            'executor': 'process' if self.use_processes else 'thread',
+            'workers': self.max_workers,
+            'in_flight': self._in_flight,
+            'queue_depth': max(0, self._in_flight - self.max_workers),
+            'max_queue': self.max_queue,
+            **self._counts,
+            'result_cache': self._analysis_cache.stats(),
+            'single_flight_shared': self._analysis_flight.shared,
+            'latency_ms': {
+                'avg': round(sum(latencies) / len(latencies), 2) if latencies else None,
+                'p95': round(latencies[math.ceil(0.95 * len(latencies)) - 1], 2) if latencies else None
+            }
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
 quantum_service = QuantumService()
\ No newline at end of file
@@ -0,0 +1,301 @@
+"""
+Symptom Lexicon (local-first normalization)
+
+Maps free-text symptom terms to canonical names without an LLM call:
+- exact lookup over English, Hindi and Marathi terms (romanized and
+  Devanagari)
+- phrases: longest known word sequences inside a longer description
+  ("high fever since 3 days" -> fever, "fever and cough" -> fever, cough);
+  a description only counts as resolved if every word other than filler
+  words is covered, so "fever and chest pain" goes to Gemini whole
+- negation: "no fever", "not vomiting", "bukhar nahi" resolve to no symptom
+- spelling variants: character trigram index with Dice similarity
+  ("bukhaar" -> fever, "vomitting" -> vomiting)
+
+Terms that still do not resolve are left for the Gemini tier.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import unicodedata
+
+# Canonical symptom -> known ways of saying it
+SYMPTOM_LEXICON: Dict[str, List[str]] = {
+    'fever': [
+        'fever', 'high fever', 'temperature', 'temp', 'feverish',
+        'bukhar', 'bukhaar', 'jwar', 'jvar', 'taap', 'tap',
+        'बुखार', 'ज्वर', 'ताप'
+    ],
+    'headache': [
+        'headache', 'head ache', 'head pain',
+        'sir dard', 'sar dard', 'sirdard', 'sar me dard', 'sir me dard',
+        'doke dukhi', 'dokedukhi', 'doka dukhne',
+        'सिरदर्द', 'सिर दर्द', 'डोकेदुखी'
+    ],
+    'vomiting': [
+        'vomiting', 'vomit', 'vomits', 'throwing up',
+        'ulti', 'ultee', 'ultiyan', 'ultya', 'ulatya',
+        'उल्टी', 'उलटी', 'उलट्या'
+    ],
+    'diarrhea': [
+        'diarrhea', 'diarrhoea', 'loose motion', 'loose motions', 'loose stools',
+        'dast', 'dasta', 'julab', 'julaab',
+        'दस्त', 'जुलाब'
+    ],
+    'body_pain': [
+        'body pain', 'body ache', 'bodyache', 'body aches',
+        'badan dard', 'sharir dard', 'ang dard',
+        'angdukhi', 'ang dukhi', 'anga dukhi',
+        'बदन दर्द', 'शरीर दर्द', 'अंगदुखी'
+    ],
+    'rash': [
+        'rash', 'rashes', 'skin rash', 'daane', 'dane', 'chakatte', 'pural', 'puri',
+        'दाने', 'चकत्ते', 'पुरळ'
+    ],
+    'cough': [
+        'cough', 'coughing', 'dry cough', 'khansi', 'khaansi', 'khasi', 'khokla', 'khokala',
+        'खांसी', 'खाँसी', 'खोकला'
+    ],
+    'nausea': [
+        'nausea', 'nauseous', 'queasy',
+        'ji machalna', 'jee machalna', 'ji michlana', 'malmal', 'mal mal',
+        'मतली', 'जी मचलाना', 'मळमळ'
+    ],
+    'fatigue': [
+        'fatigue', 'tiredness', 'tired', 'weakness', 'exhaustion',
+        'thakan', 'thakaan', 'kamzori', 'kamjori', 'thakva', 'ashaktpana',
+        'थकान', 'कमजोरी', 'कमज़ोरी', 'थकवा', 'अशक्तपणा'
+    ],
+    'breathing_difficulty': [
+        'breathing difficulty', 'difficulty breathing', 'shortness of breath',
+        'breathlessness', 'breathless',
+        'saans phoolna', 'sans phoolna', 'saans lene me taklif', 'sans lene me taklif',
+        'dam lagna', 'dhap lagne', 'dhap',
+        'सांस फूलना', 'साँस फूलना', 'दम लागणे', 'धाप'
+    ],
+    'chills': [
+        'chills', 'shivering', 'rigors', 'kapkapi', 'thand lagna', 'hudhudi',
+        'कंपकंपी', 'ठंड लगना', 'हुडहुडी'
+    ],
+    'sore_throat': [
+        'sore throat', 'throat pain', 'gale me dard', 'gala kharab', 'ghasa dukhne',
+        'गले में दर्द', 'गला खराब', 'घसा दुखणे'
+    ],
+    'stomach_pain': [
+        'stomach pain', 'stomach ache', 'stomachache', 'abdominal pain', 'tummy ache',
+        'pet dard', 'pet me dard', 'potdukhi', 'pot dukhi',
+        'पेट दर्द', 'पेट में दर्द', 'पोटदुखी'
+    ],
+    'dizziness': [
+        'dizziness', 'dizzy', 'giddiness', 'chakkar', 'chakkar aana', 'bhoval',
+        'चक्कर', 'भोवळ'
+    ],
+    'joint_pain': [
+        'joint pain', 'joint ache', 'jodon me dard', 'jod dard', 'sandhe dukhi', 'sandhidukhi',
+        'जोड़ों में दर्द', 'सांधेदुखी'
+    ],
+    'runny_nose': [
+        'runny nose', 'cold', 'common cold', 'naak behna', 'sardi', 'zukam', 'jukham',
+        'सर्दी', 'जुकाम', 'नाक बहना'
+    ],
+    'loss_of_appetite': [
+        'loss of appetite', 'no appetite', 'bhookh na lagna', 'bhook nahi', 'bhuk nahi',
+        'भूख न लगना', 'भूक नाही'
+    ],
+    'jaundice': [
+        'jaundice', 'yellow eyes', 'piliya', 'peeliya', 'kavil',
+        'पीलिया', 'कावीळ'
+    ],
+    'bleeding': [
+        'bleeding', 'bleed', 'blood loss', 'khoon bahna', 'raktasrav',
+        'खून बहना', 'रक्तस्राव'
+    ],
+    'seizure': [
+        'seizure', 'seizures', 'fits', 'convulsions', 'mirgi', 'daura', 'jhatke', 'aakadi',
+        'मिर्गी', 'दौरा', 'झटके', 'आकडी'
+    ],
+    'swelling': [
+        'swelling', 'swollen', 'sujan', 'soojan', 'suj',
+        'सूजन', 'सूज'
+    ],
+    'dehydration': [
+        'dehydration', 'dehydrated', 'pani ki kami',
+        'पानी की कमी'
+    ]
+}
+
+# Filler words a description may contain besides symptoms
+STOPWORDS = {
+    'a', 'an', 'and', 'also', 'bad', 'badly', 'day', 'days', 'for', 'from', 'has',
+    'have', 'having', 'he', 'her', 'his', 'is', 'little', 'lot', 'mild', 'morning',
+    'my', 'night', 'of', 'same', 'severe', 'she', 'since', 'slight', 'some', 'the',
+    'today', 'very', 'week', 'weeks', 'with', 'yesterday',
+    'aur', 'bahut', 'bhi', 'din', 'hai', 'hain', 'ho', 'raha', 'rahi', 'se', 'tha', 'thi',
+    'और', 'बहुत', 'भी', 'दिन', 'है', 'हैं', 'से', 'था', 'थी',
+    'ahe', 'aahe', 'ani', 'aani', 'divas', 'khup',
+    'आहे', 'आणि', 'दिवस', 'खूप'
+}
+# Words that cancel the symptom right after them ("no fever") or, failing
+# that, right before them ("bukhar nahi"); lexicon phrases that contain
+# them ("no appetite", "bhook nahi") are matched first
+NEGATIONS = {'no', 'not', 'without', 'nahi', 'nahin', 'नहीं', 'नही', 'नाही'}
+
+NGRAM_SIZE = 3
+MIN_SIMILARITY = 0.7  # Dice coefficient on character trigrams
+MIN_FUZZY_LENGTH = 4  # shorter terms only match exactly
+
+
+def normalize_key(term: str) -> str:
+    """Lowercase, punctuation / symbols to spaces, whitespace collapsed"""
+    term = unicodedata.normalize('NFC', term.lower())
+    # Category check rather than \w so Devanagari vowel signs are kept
+    term = ''.join(' ' if unicodedata.category(c)[0] in 'PS' else c for c in term)
+    return ' '.join(term.split())
+
+
+def char_ngrams(key: str, n: int = NGRAM_SIZE) -> Set[str]:
+    padded = f" {key} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+class SymptomLexicon:
+    """
+    Canonical symptom lookup with phrase and fuzzy matching
+    """
+
+    def __init__(self, entries: Dict[str, Iterable[str]] = None,
+                 min_similarity: float = MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self._exact: Dict[str, str] = {}
+        self._ngrams: Dict[str, Set[str]] = {}  # trigram -> keys containing it
+        self._key_ngrams: Dict[str, Set[str]] = {}
+        self.max_phrase_words = 1
+
+        for canonical, synonyms in (entries or SYMPTOM_LEXICON).items():
+            self.add(canonical, canonical)
+            for synonym in synonyms:
+                self.add(synonym, canonical)
+
+    def add(self, term: str, canonical: str):
+        """Register `term` as a way of saying `canonical`"""
+        key = normalize_key(term)
+        if not key:
+            return
+        self._exact[key] = canonical
+        self.max_phrase_words = max(self.max_phrase_words, len(key.split()))
+        grams = char_ngrams(key)
+        self._key_ngrams[key] = grams
+        for gram in grams:
+            self._ngrams.setdefault(gram, set()).add(key)
+
+    @property
+    def canonical_terms(self) -> Set[str]:
+        return set(self._exact.values())
+
+    # ========================================================================
+    # MATCHING
+    # ========================================================================
+
+    def _fuzzy(self, key: str) -> Optional[Tuple[str, float]]:
+        """Closest known key by trigram Dice similarity, if above threshold"""
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None
+        grams = char_ngrams(key)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._ngrams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        best, best_score = None, 0.0
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._key_ngrams[candidate]))
+            # Ties go to the alphabetically first key so results are stable
+            if score > best_score or (score == best_score and candidate < best):
+                best, best_score = candidate, score
+        if best is None or best_score < self.min_similarity:
+            return None
+        return self._exact[best], best_score
+
+    def _phrases(self, words: List[str]) -> Tuple[List[str], bool, bool]:
+        """
+        (canonical terms, fully covered, used fuzzy) for a multi-word key.
+
+        Longest known word sequences are taken left to right; left-over
+        words are tried as spelling variants. Negated symptoms are dropped.
+        `fully covered` is False if any non-filler word matched nothing.
+        """
+        items = []  # [kind, canonical]; kind: symptom | negation | other
+        fuzzy = False
+        i = 0
+        while i < len(words):
+            for length in range(min(self.max_phrase_words, len(words) - i), 0, -1):
+                canonical = self._exact.get(' '.join(words[i:i + length]))
+                if canonical:
+                    items.append(['symptom', canonical])
+                    i += length
+                    break
+            else:
+                word = words[i]
+                if word in NEGATIONS:
+                    items.append(['negation', None])
+                elif not (word in STOPWORDS or word.isdigit()):
+                    match = self._fuzzy(word)
+                    fuzzy = fuzzy or match is not None
+                    items.append(['symptom', match[0]] if match else ['other', word])
+                i += 1
+
+        for j, (kind, _) in enumerate(items):
+            if kind != 'negation':
+                continue
+            for k in (j + 1, j - 1):
+                if 0 <= k < len(items) and items[k][0] == 'symptom':
+                    items[k][0] = 'negated'
+                    break
+
+        found = [canonical for kind, canonical in items if kind == 'symptom']
+        covered = all(kind != 'other' for kind, _ in items)
+        return list(dict.fromkeys(found)), covered, fuzzy
+
+    def resolve(self, term: str) -> Tuple[List[str], str]:
+        """
+        Canonical symptoms for one term and how they were found:
+        'exact', 'phrase', 'fuzzy', 'negated' (symptoms mentioned only as
+        absent - empty list) or 'unresolved' (empty list).
+        """
+        key = normalize_key(term)
+        if key in self._exact:
+            return [self._exact[key]], 'exact'
+
+        words = key.split()
+        if len(words) > 1:
+            found, covered, fuzzy = self._phrases(words)
+            if covered:
+                if found:
+                    return found, 'fuzzy' if fuzzy else 'phrase'
+                if any(word in NEGATIONS for word in words):
+                    return [], 'negated'
+            if any(word in NEGATIONS for word in words):
+                return [], 'unresolved'
+
+        # Whole-term spelling variant ("sar dardd", "loose motionss")
+        match = self._fuzzy(key)
+        if match:
+            return [match[0]], 'fuzzy'
+
+        return [], 'unresolved'
+
+    def resolve_all(self, terms: List[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        (term -> canonical symptoms for resolved terms, unresolved terms).
+        Negated terms are resolved to an empty list.
+        """
+        resolved, unresolved = {}, []
+        for term in terms:
+            canonical, how = self.resolve(term)
+            if canonical or how == 'negated':
+                resolved[term] = canonical
+            else:
+                unresolved.append(term)
+        return resolved, unresolved
+
+
+symptom_lexicon = SymptomLexicon()
@@ -17,6 +17,8 @@ const Dashboard = ({ user, onLogout }) => {
     const isAnalyzingRef = React.useRef(false);
     // Persist dispatched alerts across fetches
     const dispatchedAlertsRef = React.useRef(new Set());
+    // Last seen communication sequence number (cursor pagination)
+    const commsCursorRef = React.useRef(null);
 
     const [data, setData] = useState({
         stats: { active_villages: 0, total_reports: 0, high_risk_villages: 0 },
@@ -36,8 +38,11 @@ const Dashboard = ({ user, onLogout }) => {
                     api.get('/api/v1/swarm/agents'),
                     api.get('/api/v1/quantum/insights'),
                     api.get('/api/v1/analytics/dashboard'),
-                    api.get('/api/v1/swarm/communications?limit=50')
+                    api.get(commsCursorRef.current === null
+                        ? '/api/v1/swarm/communications?limit=50'
+                        : `/api/v1/swarm/communications?limit=50&since=${commsCursorRef.current}`)
                 ]);
+                commsCursorRef.current = commsRes.next_cursor ?? commsCursorRef.current;
 
                 // Transform Alerts
                 const swarmAgents = agentsRes.agents || {};
@@ -68,7 +73,7 @@ const Dashboard = ({ user, onLogout }) => {
 
                 const finalAlerts = generatedAlerts.length > 0 ? generatedAlerts : mockAlerts;
 
-                setData({
+                setData(prev => ({
                     stats: dashboardRes || { active_villages: Object.keys(swarmAgents).length, total_reports: 0, high_risk_villages: 0 },
                     swarm: swarmAgents,
                     alerts: finalAlerts,
@@ -77,8 +82,9 @@ const Dashboard = ({ user, onLogout }) => {
                         hiddenCorrelations: quantumRes.hidden_correlations?.length || 0,
                         affected: quantumRes.high_risk_villages || []
                     },
-                    comms: commsRes.communications || []
-                });
+                    // Append only new messages, keep the latest 50
+                    comms: [...prev.comms, ...(commsRes.communications || [])].slice(-50)
+                }));
             } catch (err) {
                 console.error("Dashboard Sync Failed", err);
                 // Fallback or Toast here
@@ -88,8 +94,40 @@ const Dashboard = ({ user, onLogout }) => {
         };
 
         fetchData();
-        const interval = setInterval(fetchData, 15000); // Live poll
-        return () => clearInterval(interval);
+        const interval = setInterval(fetchData, 15000); // Fallback poll
+
+        // Live push: append communications and apply agent deltas as they happen
+        const events = api.stream('/api/v1/swarm/stream');
+        events.addEventListener('communication', (e) => {
+            const msg = JSON.parse(e.data);
+            if (commsCursorRef.current !== null && msg.seq <= commsCursorRef.current) return;
+            commsCursorRef.current = msg.seq;
+            setData(prev => ({ ...prev, comms: [...prev.comms, msg].slice(-50) }));
+        });
+        events.addEventListener('agent_update', (e) => {
+            const update = JSON.parse(e.data);
+            setData(prev => {
+                const agent = prev.swarm[update.village_id];
+                if (!agent) return prev;
+                return {
+                    ...prev,
+                    swarm: {
+                        ...prev.swarm,
+                        [update.village_id]: {
+                            ...agent,
+                            outbreak_belief: update.outbreak_belief,
+                            risk_level: update.risk_level,
+                            symptom_count: update.symptom_count
+                        }
+                    }
+                };
+            });
+        });
+
+        return () => {
+            clearInterval(interval);
+            events.close();
+        };
     }, []);
 
     const handleApproveAlert = (id) => {
@@ -106,8 +144,15 @@ const Dashboard = ({ user, onLogout }) => {
         isAnalyzingRef.current = true;
 
         try {
-            // Simulate a slight delay for effect if the API is too fast, or just real call
-            const result = await api.post('/api/v1/quantum/analyze', {});
+            // Analysis runs as a background job: submit, then poll until it finishes
+            const job = await api.post('/api/v1/quantum/analyze', {});
+            let current = await api.get(job.status_url);
+            while (current.status === 'queued' || current.status === 'running') {
+                await new Promise(resolve => setTimeout(resolve, 500));
+                current = await api.get(job.status_url);
+            }
+            if (current.status !== 'completed') throw new Error(current.error || 'Quantum job failed');
+            const result = current.result;
 
             setData(prev => ({
                 ...prev,
@@ -139,7 +184,7 @@ const Dashboard = ({ user, onLogout }) => {
                             <StatCard title="Active Villages" value={data.stats.active_villages} icon={Users} color="blue" />
                             <StatCard title="Critical Alerts" value={data.alerts.filter(a => a.status === 'pending').length} icon={AlertTriangle} color="red" />
                             <StatCard title="Swarm Health" value="98.2%" icon={ShieldCheck} color="emerald" subtext="+0.4%" />
-                            <StatCard title="Reports Today" value={data.stats.total_reports} icon={Activity} color="indigo" />
+                            <StatCard title="Reports Today" value={data.stats.report_rates?.["24h"] ?? data.stats.total_reports} icon={Activity} color="indigo" />
                         </div>
 
                         <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
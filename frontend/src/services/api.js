@@ -29,5 +29,9 @@ export const api = {
         });
         if (!res.ok) throw new Error(`API Error: ${res.status}`);
         return res.json();
+    },
+    stream(endpoint) {
+        // Server-Sent Events; the browser reconnects automatically
+        return new EventSource(`${API_BASE}${endpoint}`);
     }
 };
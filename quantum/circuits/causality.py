@@ -2,6 +2,8 @@ import cirq
 import numpy as np
 from typing import List, Dict, Tuple
 
+from quantum.simulators import compiled_circuit
+
 class CausalityAnalysisCircuit:
     """
     Quantum circuit for discovering hidden causal relationships
@@ -13,21 +15,16 @@ class CausalityAnalysisCircuit:
         self.qubits = cirq.GridQubit.rect(2, num_variables)  # 2D grid
         self.simulator = cirq.Simulator()
     
-    def build_causality_circuit(self, correlation_matrix: np.ndarray) -> cirq.Circuit:
-        """
-        Build circuit to analyze causal relationships
-        
-        Args:
-            correlation_matrix: Matrix of correlations between variables
-        """
-        circuit = cirq.Circuit()
+    def causality_ops(self, correlation_matrix: np.ndarray) -> List[Tuple]:
+        """Gate list for the causality circuit (indices into self.qubits)"""
+        num_qubits = len(self.qubits)
         
         # Initialize all qubits in superposition
-        circuit.append(cirq.H.on_each(*self.qubits))
+        ops = [('h', q) for q in range(num_qubits)]
         
         # Encode correlations as entanglement
-        for i in range(len(self.qubits) - 1):
-            for j in range(i + 1, len(self.qubits)):
+        for i in range(num_qubits - 1):
+            for j in range(i + 1, num_qubits):
                 # Correlation strength determines entanglement strength
                 if i < len(correlation_matrix) and j < len(correlation_matrix[0]):
                     correlation = correlation_matrix[i][j]
@@ -35,17 +32,27 @@ class CausalityAnalysisCircuit:
                     if abs(correlation) > 0.3:  # Threshold for significant correlation
                         # Create entanglement proportional to correlation
                         angle = np.pi * abs(correlation)
-                        circuit.append(cirq.CNOT(self.qubits[i], self.qubits[j]))
-                        circuit.append(cirq.rz(angle)(self.qubits[j]))
+                        ops += [('cnot', i, j), ('rz', j, angle)]
         
         # Apply quantum interference
-        for qubit in self.qubits:
-            circuit.append(cirq.H(qubit))
+        ops += [('h', q) for q in range(num_qubits)]
         
-        # Measurement
-        circuit.append(cirq.measure(*self.qubits, key='causality'))
+        return ops
+    
+    def build_causality_circuit(self, correlation_matrix: np.ndarray) -> cirq.Circuit:
+        """
+        Build circuit to analyze causal relationships
         
-        return circuit
+        The entanglement pattern (which pairs pass the threshold) selects a
+        cached gate layout; only the RZ gates are created per call.
+        
+        Args:
+            correlation_matrix: Matrix of correlations between variables
+        """
+        return compiled_circuit(
+            len(self.qubits), self.causality_ops(correlation_matrix),
+            measure_key='causality', qubits=self.qubits
+        )
     
     def analyze_causality(self, village_data: List[Dict]) -> Dict:
         """
@@ -1,17 +1,128 @@
 import cirq
 import numpy as np
-from typing import List, Dict, Tuple
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Dict, Tuple, Union
+
+from quantum.simulators import (
+    BACKENDS, SimulatorBackend, compiled_circuit, get_backend, qubit_marginals
+)
+
+# (gamma, beta) search box - same range the random search sampled from
+SEARCH_BOUNDS = (0.1 * np.pi, 0.5 * np.pi)
+
+# Candidate batches are split across processes from this many qubits up
+PARALLEL_MIN_VILLAGES = 12
+
+
+def qaoa_ops(
+    num_villages: int,
+    village_priorities: List[float],
+    depth: int,
+    gamma: Union[float, np.ndarray],
+    beta: Union[float, np.ndarray]
+) -> List[Tuple]:
+    """
+    Gate list for the QAOA circuit (see quantum/simulators.py).
+    gamma / beta may be arrays [B] to describe B candidate circuits at once.
+    """
+    gamma, beta = np.asarray(gamma), np.asarray(beta)
+    ops = [('h', q) for q in range(num_villages)]
+    
+    for layer in range(depth):
+        ops += [
+            ('rz', i, gamma * priority)
+            for i, priority in enumerate(village_priorities[:num_villages])
+        ]
+        ops += [('cz', i, i + 1) for i in range(num_villages - 1)]
+        ops += [('rx', q, beta) for q in range(num_villages)]
+    
+    return ops
+
+
+def evaluate_candidates(
+    num_villages: int,
+    village_priorities: List[float],
+    gammas: np.ndarray,
+    betas: np.ndarray,
+    depth: int = 2,
+    backend: Union[str, SimulatorBackend] = 'numpy',
+    shots: int = None,
+    seed: int = None
+) -> np.ndarray:
+    """
+    Mean measurement per qubit [B, num_villages] for each (gamma, beta)
+    candidate, from one batched simulation. Exact unless `shots` is set.
+    
+    Module-level (and taking a backend name) so it can run in a worker process.
+    """
+    backend = get_backend(backend)
+    gammas, betas = np.asarray(gammas, dtype=np.float64), np.asarray(betas, dtype=np.float64)
+    ops = qaoa_ops(num_villages, village_priorities, depth, gammas, betas)
+    
+    if shots:
+        bits = backend.sample(num_villages, ops, shots, batch_size=len(gammas), seed=seed)
+        return bits.mean(axis=1)
+    
+    states = backend.statevectors(num_villages, ops, batch_size=len(gammas))
+    return qubit_marginals(states, num_villages)
+
 
 class ResourceOptimizationCircuit:
     """
     QAOA (Quantum Approximate Optimization Algorithm) circuit
     for resource allocation optimization
+    
+    (gamma, beta) are searched by batched grid refinement (default) or
+    Nelder-Mead, with early stopping. Pass `seed` for reproducible runs.
+    
+    Large circuits split candidate batches across `executor` if given,
+    otherwise across a process pool created on first use and reused by
+    later calls (release it with close()).
     """
     
-    def __init__(self, num_villages: int):
+    def __init__(
+        self,
+        num_villages: int,
+        backend: Union[str, SimulatorBackend] = 'numpy',
+        seed: int = None,
+        shots: int = None,
+        max_workers: int = None,
+        executor: Executor = None
+    ):
         self.num_villages = num_villages
         self.qubits = cirq.LineQubit.range(num_villages)
-        self.simulator = cirq.Simulator()
+        self.backend = get_backend(backend)
+        self.rng = np.random.default_rng(seed)
+        self.shots = shots
+        self.max_workers = max_workers
+        self.executor = executor
+        self._pool: ProcessPoolExecutor = None
+        self.last_search: Dict = {}
+    
+    @property
+    def _workers(self) -> int:
+        return self.max_workers or os.cpu_count() or 1
+    
+    def _get_pool(self) -> Executor:
+        """Executor for candidate chunks, or None to evaluate in-process."""
+        if self.num_villages < PARALLEL_MIN_VILLAGES or self._workers < 2:
+            return None
+        # Workers rebuild the backend from its name, so only built-in
+        # backends can be parallelized; custom instances run in-process
+        if type(self.backend) is not BACKENDS.get(self.backend.name):
+            return None
+        if self.executor is not None:
+            return self.executor
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        return self._pool
+    
+    def close(self):
+        """Shut down the process pool this instance created (if any)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
     
     def build_qaoa_circuit(
         self,
@@ -34,72 +145,151 @@ class ResourceOptimizationCircuit:
         if beta is None:
             beta = np.pi / 8
         
-        circuit = cirq.Circuit()
-        
-        # Initial state: Equal superposition
-        circuit.append(cirq.H.on_each(*self.qubits))
-        
-        # QAOA layers
-        for layer in range(depth):
-            # Cost Hamiltonian (encode priorities)
-            for i, priority in enumerate(village_priorities):
-                if i < len(self.qubits):
-                    # Rotation proportional to priority
-                    angle = gamma * priority
-                    circuit.append(cirq.rz(angle)(self.qubits[i]))
-            
-            # Interaction terms (neighboring villages)
-            for i in range(len(self.qubits) - 1):
-                circuit.append(cirq.CZ(self.qubits[i], self.qubits[i + 1]))
-            
-            # Mixer Hamiltonian (exploration)
-            for qubit in self.qubits:
-                circuit.append(cirq.rx(beta)(qubit))
-        
-        # Measurement
-        circuit.append(cirq.measure(*self.qubits, key='allocation'))
-        
-        return circuit
+        # Gate layout cached per (qubits, depth); only the rotations are rebuilt
+        return compiled_circuit(
+            self.num_villages,
+            qaoa_ops(self.num_villages, village_priorities, depth, gamma, beta),
+            measure_key='allocation', qubits=self.qubits
+        )
     
     def optimize_allocation(
         self,
         villages: List[Dict],
         resources: Dict,
-        iterations: int = 50
+        iterations: int = 50,
+        method: str = 'grid',
+        grid_size: int = 4,
+        tol: float = 1e-4
     ) -> List[Dict]:
         """
         Optimize resource allocation using QAOA
         
+        Args:
+            iterations: budget of (gamma, beta) evaluations
+            method: 'grid' (batched grid refinement) or 'nelder-mead' (scipy)
+            grid_size: candidates per axis in each grid round
+            tol: stop once a round improves the cost by less than this
+        
         Returns optimized allocation plan
         """
         # Extract priorities
         priorities = [v.get('outbreak_belief', 0.5) for v in villages[:self.num_villages]]
         
-        best_allocation = None
-        best_cost = float('inf')
+        if method == 'nelder-mead':
+            gamma, beta, cost, weights, evaluations = self._search_nelder_mead(
+                priorities, iterations, tol
+            )
+        elif method == 'grid':
+            gamma, beta, cost, weights, evaluations = self._search_grid(
+                priorities, iterations, grid_size, tol, self._get_pool()
+            )
+        else:
+            raise ValueError(f"Unknown optimization method: {method}")
         
-        # Run multiple iterations with different parameters
-        for i in range(iterations):
-            # Vary QAOA parameters
-            gamma = np.pi * np.random.uniform(0.1, 0.5)
-            beta = np.pi * np.random.uniform(0.1, 0.5)
-            
-            # Build and run circuit
-            circuit = self.build_qaoa_circuit(priorities, depth=2, gamma=gamma, beta=beta)
-            result = self.simulator.run(circuit, repetitions=10)
-            measurements = result.measurements['allocation']
+        self.last_search = {
+            'method': method,
+            'gamma': float(gamma),
+            'beta': float(beta),
+            'cost': float(cost),
+            'evaluations': evaluations
+        }
+        
+        # Extract allocation from the best candidate's measurement means
+        return self._extract_allocation(weights[None, :], villages, resources)
+    
+    def _evaluate(
+        self,
+        priorities: List[float],
+        gammas: np.ndarray,
+        betas: np.ndarray,
+        pool: Executor = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(costs [B], measurement means [B, num_villages]) for a candidate batch."""
+        seeds = self.rng.integers(2**32, size=max(1, len(gammas)))
+        
+        if pool is None or len(gammas) < 2:
+            weights = evaluate_candidates(
+                self.num_villages, priorities, gammas, betas,
+                backend=self.backend, shots=self.shots, seed=seeds[0]
+            )
+        else:
+            chunks = np.array_split(np.arange(len(gammas)), self._workers)
+            futures = [
+                pool.submit(
+                    evaluate_candidates, self.num_villages, priorities,
+                    gammas[chunk], betas[chunk], 2, self.backend.name,
+                    self.shots, seeds[k]
+                )
+                for k, chunk in enumerate(chunks) if len(chunk)
+            ]
+            weights = np.concatenate([f.result() for f in futures])
+        
+        return self._calculate_costs(weights, priorities), weights
+    
+    def _search_grid(
+        self,
+        priorities: List[float],
+        iterations: int,
+        grid_size: int,
+        tol: float,
+        pool: Executor = None
+    ):
+        """
+        Batched grid refinement: evaluate a jittered grid over the search
+        box in one sweep, then shrink the box around the best candidate.
+        """
+        low = np.array([SEARCH_BOUNDS[0]] * 2)
+        high = np.array([SEARCH_BOUNDS[1]] * 2)
+        rounds = max(1, iterations // (grid_size * grid_size))
+        best, evaluations = None, 0
+        
+        for _ in range(rounds):
+            # One candidate per grid cell, jittered by the seeded RNG
+            cell = (high - low) / grid_size
+            index = np.stack(np.meshgrid(np.arange(grid_size), np.arange(grid_size),
+                                         indexing='ij'), axis=-1).reshape(-1, 2)
+            candidates = low + (index + self.rng.random(index.shape)) * cell
             
-            # Extract allocation from measurements
-            allocation = self._extract_allocation(measurements, villages, resources)
+            costs, weights = self._evaluate(priorities, candidates[:, 0], candidates[:, 1], pool)
+            evaluations += len(candidates)
             
-            # Calculate cost
-            cost = self._calculate_cost(allocation, priorities)
+            i = int(np.argmin(costs))
+            improved = best is None or best[2] - costs[i] >= tol
+            if best is None or costs[i] < best[2]:
+                best = (candidates[i, 0], candidates[i, 1], costs[i], weights[i])
+            if not improved:
+                break  # early stopping
             
-            if cost < best_cost:
-                best_cost = cost
-                best_allocation = allocation
+            # Zoom in on the best cell
+            center = np.array(best[:2])
+            low = np.maximum(center - cell, SEARCH_BOUNDS[0])
+            high = np.minimum(center + cell, SEARCH_BOUNDS[1])
+        
+        return best + (evaluations,)
+    
+    def _search_nelder_mead(self, priorities: List[float], iterations: int, tol: float):
+        """Nelder-Mead on (gamma, beta) inside the search box (scipy)."""
+        from scipy.optimize import minimize
+        
+        evaluated = {}
+        
+        def objective(x):
+            costs, weights = self._evaluate(priorities, x[:1], x[1:])
+            evaluated[tuple(x)] = weights[0]
+            return costs[0]
         
-        return best_allocation
+        x0 = self.rng.uniform(*SEARCH_BOUNDS, size=2)
+        result = minimize(
+            objective, x0, method='Nelder-Mead',
+            bounds=[SEARCH_BOUNDS, SEARCH_BOUNDS],
+            options={'maxfev': iterations, 'fatol': tol, 'xatol': 1e-3}
+        )
+        weights = evaluated.get(tuple(result.x))
+        if weights is None:
+            _, weights = self._evaluate(priorities, result.x[:1], result.x[1:])
+            weights = weights[0]
+        
+        return result.x[0], result.x[1], result.fun, weights, result.nfev
     
     def _extract_allocation(
         self,
@@ -141,19 +331,16 @@ class ResourceOptimizationCircuit:
         
         return allocations
     
-    def _calculate_cost(self, allocation: List[Dict], priorities: List[float]) -> float:
+    def _calculate_costs(self, weights: np.ndarray, priorities: List[float]) -> np.ndarray:
         """
-        Calculate cost function for allocation
-        Lower cost = better allocation
+        Vectorized cost for a batch of measurement means [B, num_villages]:
+        sum of |priority - normalized allocation weight| per village.
         """
-        cost = 0.0
-        
-        for i, alloc in enumerate(allocation):
-            if i < len(priorities):
-                priority = priorities[i]
-                weight = alloc['allocation_weight']
-                
-                # Cost increases if high-priority village gets low allocation
-                cost += abs(priority - weight)
-        
-        return cost
+        totals = weights.sum(axis=1, keepdims=True)
+        normalized = np.divide(
+            weights, totals,
+            out=np.full_like(weights, 1.0 / weights.shape[1]),
+            where=totals > 0
+        )
+        priorities = np.asarray(priorities, dtype=np.float64)
+        return np.abs(priorities - normalized[:, :len(priorities)]).sum(axis=1)
@@ -1,6 +1,8 @@
 import cirq
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Tuple
+
+from quantum.simulators import compiled_circuit
 
 class PatternDetectionCircuit:
     """
@@ -13,42 +15,45 @@ class PatternDetectionCircuit:
         self.qubits = cirq.LineQubit.range(num_qubits)
         self.simulator = cirq.Simulator()
     
-    def build_circuit(self, symptom_params: List[float]) -> cirq.Circuit:
-        """
-        Build pattern detection circuit
-        
-        Args:
-            symptom_params: Parameters encoding symptom data
-        
-        Returns:
-            Quantum circuit
-        """
-        circuit = cirq.Circuit()
+    def circuit_ops(self, symptom_params: List[float]) -> List[Tuple]:
+        """Gate list for the pattern detection circuit (see quantum/simulators.py)"""
+        qubits = range(self.num_qubits)
         
         # Layer 1: Initialization (Hadamard gates)
-        circuit.append(cirq.H.on_each(*self.qubits))
+        ops = [('h', q) for q in qubits]
         
         # Layer 2: Encode symptom data
-        for i, param in enumerate(symptom_params[:self.num_qubits]):
-            circuit.append(cirq.ry(param)(self.qubits[i]))
+        ops += [('ry', i, param) for i, param in enumerate(symptom_params[:self.num_qubits])]
         
         # Layer 3: Entanglement (capture spatial correlations)
-        for i in range(self.num_qubits - 1):
-            circuit.append(cirq.CNOT(self.qubits[i], self.qubits[i + 1]))
+        ops += [('cnot', i, i + 1) for i in range(self.num_qubits - 1)]
         
         # Layer 4: Parameterized rotations (learnable)
-        for qubit in self.qubits:
-            circuit.append(cirq.rx(np.pi / 4)(qubit))
-            circuit.append(cirq.rz(np.pi / 6)(qubit))
+        for q in qubits:
+            ops += [('rx', q, np.pi / 4), ('rz', q, np.pi / 6)]
         
         # Layer 5: Additional entanglement
-        for i in range(0, self.num_qubits - 1, 2):
-            circuit.append(cirq.CZ(self.qubits[i], self.qubits[i + 1]))
+        ops += [('cz', i, i + 1) for i in range(0, self.num_qubits - 1, 2)]
         
-        # Measurement
-        circuit.append(cirq.measure(*self.qubits, key='pattern'))
+        return ops
+    
+    def build_circuit(self, symptom_params: List[float]) -> cirq.Circuit:
+        """
+        Build pattern detection circuit
+        
+        The gate layout is cached per structure (see compiled_circuit), so
+        only the rotation gates are created per call.
         
-        return circuit
+        Args:
+            symptom_params: Parameters encoding symptom data
+        
+        Returns:
+            Quantum circuit
+        """
+        return compiled_circuit(
+            self.num_qubits, self.circuit_ops(symptom_params),
+            measure_key='pattern', qubits=self.qubits
+        )
     
     def encode_symptoms(self, village_symptoms: List[Dict]) -> List[float]:
         """
@@ -1,22 +1,38 @@
 """
 Quantum Computing with Cirq (Pure Simulation)
 Works on Windows, Linux, macOS
+
+Circuits are simulated on a pluggable backend (see quantum/simulators.py):
+'cirq' (default) or 'numpy', a batched statevector engine that does not
+need Cirq at all.
 """
 
-import cirq
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple, Union
 from sklearn.neural_network import MLPClassifier
 
+from quantum.simulators import (
+    SimulatorBackend, compiled_circuit, get_backend, qubit_marginals
+)
+
+
 class QuantumPatternDetector:
     """
     Quantum-inspired pattern detection using Cirq simulation
+    
+    By default each village's signature is computed exactly from the final
+    statevector (deterministic). Pass `shots` to sample measurements instead.
+    
+    All villages are evaluated in one batched backend call: the RY angles
+    are per-village columns of a single gate list (a symbolic template
+    swept over villages on the Cirq backend).
     """
     
-    def __init__(self, num_qubits: int = 8):
+    def __init__(self, num_qubits: int = 8, shots: int = None,
+                 backend: Union[str, SimulatorBackend] = None):
         self.num_qubits = num_qubits
-        self.qubits = cirq.LineQubit.range(num_qubits)
-        self.simulator = cirq.Simulator()
+        self.shots = shots
+        self.backend = get_backend(backend)
         
         # Classical ML for hybrid approach
         self.classical_model = MLPClassifier(
@@ -25,33 +41,51 @@ class QuantumPatternDetector:
             max_iter=1000
         )
     
-    def build_pattern_circuit(self, symptom_data: Dict) -> cirq.Circuit:
+    def pattern_ops(self, angles: np.ndarray) -> List[Tuple]:
         """
-        Build quantum circuit for pattern detection
+        Gate list for the pattern circuit. `angles` is [num_qubits] for one
+        village or [B, num_qubits] for a batch.
         """
-        circuit = cirq.Circuit()
+        angles = np.asarray(angles, dtype=np.float64)
+        qubits = range(self.num_qubits)
         
         # Initialize qubits in superposition
-        circuit.append(cirq.H.on_each(*self.qubits))
+        ops = [('h', q) for q in qubits]
         
         # Encode symptom data as rotation angles
-        angles = self._symptoms_to_angles(symptom_data)
-        for i, angle in enumerate(angles):
-            if i < len(self.qubits):
-                circuit.append(cirq.ry(angle)(self.qubits[i]))
+        ops += [('ry', q, angles[..., q]) for q in qubits]
         
         # Create entanglement (captures correlations between villages)
-        for i in range(len(self.qubits) - 1):
-            circuit.append(cirq.CNOT(self.qubits[i], self.qubits[i+1]))
+        ops += [('cnot', q, q + 1) for q in range(self.num_qubits - 1)]
         
         # Apply parameterized gates
-        for qubit in self.qubits:
-            circuit.append(cirq.rx(np.pi/4)(qubit))
+        ops += [('rx', q, np.pi/4) for q in qubits]
         
-        # Measurement
-        circuit.append(cirq.measure(*self.qubits, key='result'))
+        return ops
+    
+    def build_pattern_circuit(self, symptom_data: Dict, measure: bool = True):
+        """
+        Build quantum circuit for pattern detection as a cirq.Circuit
+        (without the final measurement when `measure` is False)
+        """
+        ops = self.pattern_ops(self._symptoms_to_angles(symptom_data))
+        return compiled_circuit(self.num_qubits, ops, measure_key='result' if measure else None)
+    
+    def _signatures(self, symptom_data: List[Dict]) -> List[float]:
+        """
+        Mean measured bit value over all qubits ("quantum signature") per
+        village, from one batched simulation.
+        Exact from the statevectors unless shot sampling is enabled.
+        """
+        angles = np.array([self._symptoms_to_angles(v) for v in symptom_data])
+        ops = self.pattern_ops(angles)
+        
+        if self.shots:
+            bits = self.backend.sample(self.num_qubits, ops, self.shots, batch_size=len(angles))
+            return bits.mean(axis=(1, 2)).tolist()
         
-        return circuit
+        states = self.backend.statevectors(self.num_qubits, ops, batch_size=len(angles))
+        return qubit_marginals(states, self.num_qubits).mean(axis=1).tolist()
     
     async def detect_outbreak_pattern(self, symptom_data: List[Dict]) -> Dict:
         """
@@ -64,21 +98,8 @@ class QuantumPatternDetector:
                 'confidence': 0.0
             }
         
-        # Build circuits for each village
-        circuits = []
-        for village_data in symptom_data:
-            circuit = self.build_pattern_circuit(village_data)
-            circuits.append(circuit)
-        
-        # Run quantum simulation
-        results = []
-        for circuit in circuits:
-            result = self.simulator.run(circuit, repetitions=100)
-            measurements = result.measurements['result']
-            
-            # Calculate "quantum signature"
-            signature = np.mean(measurements)
-            results.append(signature)
+        # Run quantum simulation ("quantum signature" per village)
+        results = self._signatures(symptom_data)
         
         # Aggregate results
         outbreak_probability = self._calculate_outbreak_probability(results)
@@ -88,7 +109,7 @@ class QuantumPatternDetector:
             'quantum_enhanced': True,
             'confidence': 0.85,
             'quantum_signatures': results,
-            'method': 'cirq_simulation'
+            'method': f"{self.backend.name}_{'sampling' if self.shots else 'statevector'}"
         }
     
     def _symptoms_to_angles(self, village_data: Dict) -> List[float]:
@@ -136,34 +157,42 @@ class QuantumResourceOptimizer:
     Uses QAOA-inspired classical algorithm
     """
     
-    def __init__(self, num_villages: int = 10):
+    def __init__(self, num_villages: int = 10, shots: int = 100,
+                 backend: Union[str, SimulatorBackend] = None):
         self.num_villages = num_villages
-        self.qubits = cirq.LineQubit.range(num_villages)
-        self.simulator = cirq.Simulator()
+        self.shots = shots
+        self.backend = get_backend(backend)
     
-    def build_qaoa_circuit(self, village_priorities: List[float], depth: int = 2) -> cirq.Circuit:
+    def qaoa_ops(self, village_priorities: Sequence[float], depth: int = 2) -> List[Tuple]:
         """
-        Build QAOA-inspired circuit for resource optimization
+        Gate list for the QAOA-inspired circuit
         """
-        circuit = cirq.Circuit()
+        qubits = range(self.num_villages)
         
         # Initial superposition
-        circuit.append(cirq.H.on_each(*self.qubits))
+        ops = [('h', q) for q in qubits]
         
         # QAOA layers
         for _ in range(depth):
             # Cost layer (encode priorities)
-            for i, priority in enumerate(village_priorities):
-                if i < len(self.qubits):
-                    circuit.append(cirq.rz(priority * np.pi)(self.qubits[i]))
+            ops += [
+                ('rz', i, priority * np.pi)
+                for i, priority in enumerate(village_priorities[:self.num_villages])
+            ]
             
             # Mixer layer
-            circuit.append(cirq.rx(np.pi/4).on_each(*self.qubits))
+            ops += [('rx', q, np.pi/4) for q in qubits]
         
-        # Measurement
-        circuit.append(cirq.measure(*self.qubits, key='allocation'))
-        
-        return circuit
+        return ops
+    
+    def build_qaoa_circuit(self, village_priorities: List[float], depth: int = 2):
+        """
+        Build QAOA-inspired circuit for resource optimization as a cirq.Circuit
+        """
+        return compiled_circuit(
+            self.num_villages, self.qaoa_ops(village_priorities, depth),
+            measure_key='allocation'
+        )
     
     async def optimize_allocation(self, villages: List[Dict], resources: Dict) -> List[Dict]:
         """
@@ -176,9 +205,8 @@ class QuantumResourceOptimizer:
         priorities = [v.get('outbreak_belief', 0.5) for v in villages]
         
         # Build and run QAOA circuit
-        circuit = self.build_qaoa_circuit(priorities)
-        result = self.simulator.run(circuit, repetitions=100)
-        measurements = result.measurements['allocation']
+        ops = self.qaoa_ops(priorities)
+        measurements = self.backend.sample(self.num_villages, ops, self.shots)[0]
         
         # Extract most common allocation pattern
         allocation_scores = np.mean(measurements, axis=0)
@@ -211,11 +239,15 @@ class QuantumService:
     """
     Quantum service using Cirq simulation
     Drop-in replacement for TensorFlow Quantum
+    
+    `backend` selects the simulator ('cirq' or 'numpy', or a
+    SimulatorBackend instance) shared by both circuits.
     """
     
-    def __init__(self):
-        self.pattern_detector = QuantumPatternDetector(num_qubits=8)
-        self.resource_optimizer = QuantumResourceOptimizer(num_villages=10)
+    def __init__(self, backend: Union[str, SimulatorBackend] = None):
+        self.backend = get_backend(backend)
+        self.pattern_detector = QuantumPatternDetector(num_qubits=8, backend=self.backend)
+        self.resource_optimizer = QuantumResourceOptimizer(num_villages=10, backend=self.backend)
     
     async def analyze_outbreak_pattern(self, swarm_data: Dict) -> Dict:
         """
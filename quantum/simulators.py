@@ -0,0 +1,432 @@
+"""
+Statevector Simulator Backends
+
+The service circuits are small (8-10 qubits) with a fixed gate set, so
+they are described with a tiny gate list instead of cirq objects and run
+on a pluggable backend:
+
+- NumpyBackend: hand-rolled statevector engine, no Cirq import needed.
+  Gates are applied as tensor ops over a leading batch axis, so many
+  villages / parameter sets are simulated at once. Each gate-list
+  structure is compiled once: fixed layers become precomputed index
+  permutations (CNOT chains) and phase vectors (CZ / RZ runs), and a
+  leading H layer is a precomputed uniform state.
+- CirqBackend: same gate list run through cirq.Simulator as a parameter
+  sweep over a symbolic template (Cirq is imported lazily).
+
+compiled_circuit() returns a cirq.Circuit for a gate list from a cached
+moment layout, so the circuit builders only create the rotation gates
+per call.
+
+Gate list format (qubit indices are ints, qubit 0 = most significant bit,
+matching Cirq's big-endian ordering):
+    ('h', q)
+    ('rx', q, theta)  ('ry', q, theta)  ('rz', q, theta)
+    ('cnot', control, target)  ('cz', q1, q2)
+theta is a float or an array of shape [B] (one angle per batch element).
+Rotations follow Cirq: rz(theta) = exp(-i Z theta / 2), etc.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, Union
+import threading
+import numpy as np
+
+ROTATIONS = ('rx', 'ry', 'rz')
+
+_H = np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2)
+
+# Compiled structures / symbolic templates kept per backend, moment layouts per process
+PROGRAM_CACHE_SIZE = 64
+TEMPLATE_CACHE_SIZE = 128
+
+
+def qubit_marginals(state_vectors: np.ndarray, num_qubits: int) -> np.ndarray:
+    """
+    Exact probability of measuring 1 on each qubit.
+
+    Accepts one statevector [2**n] or a batch [B, 2**n] and returns [n]
+    or [B, n]. Qubit i is axis i of the [2] * num_qubits probability tensor.
+    """
+    state_vectors = np.asarray(state_vectors)
+    probs = (np.abs(state_vectors) ** 2).reshape((-1,) + (2,) * num_qubits)
+    marginals = np.empty((probs.shape[0], num_qubits))
+    for i in range(num_qubits):
+        others = tuple(a + 1 for a in range(num_qubits) if a != i)
+        marginals[:, i] = probs.sum(axis=others)[:, 1]
+    marginals /= probs.reshape(probs.shape[0], -1).sum(axis=1, keepdims=True)
+    return marginals[0] if state_vectors.ndim == 1 else marginals
+
+
+def batch_size_of(ops: Sequence[Tuple], default: int = 1) -> int:
+    """Batch size implied by the array-valued angles in a gate list."""
+    sizes = {np.size(op[2]) for op in ops if op[0] in ROTATIONS and np.ndim(op[2]) > 0}
+    if len(sizes) > 1:
+        raise ValueError(f"Inconsistent batch sizes in gate list: {sorted(sizes)}")
+    return sizes.pop() if sizes else default
+
+
+def gate_structure(ops: Sequence[Tuple]) -> Tuple:
+    """Gate list with the rotation angles dropped (the cache key for compiled forms)."""
+    return tuple(op[:2] if op[0] in ROTATIONS else tuple(op) for op in ops)
+
+
+def _bits(num_qubits: int, qubit: int) -> np.ndarray:
+    """Value of `qubit` in every basis index (qubit 0 = most significant bit)."""
+    return (np.arange(2 ** num_qubits) >> (num_qubits - 1 - qubit)) & 1
+
+
+def rotation_matrix(gate: str, theta: Union[float, np.ndarray]) -> np.ndarray:
+    """[2, 2] matrix for a scalar angle, [B, 2, 2] for an array of angles."""
+    theta = np.asarray(theta, dtype=np.float64)
+    c = np.cos(theta / 2).astype(np.complex128)
+    s = np.sin(theta / 2).astype(np.complex128)
+    if gate == 'rx':
+        rows = [[c, -1j * s], [-1j * s, c]]
+    elif gate == 'ry':
+        rows = [[c, -s], [s, c]]
+    elif gate == 'rz':
+        rows = [[np.exp(-0.5j * theta), np.zeros_like(c)], [np.zeros_like(c), np.exp(0.5j * theta)]]
+    else:
+        raise ValueError(f"Unknown rotation: {gate}")
+    return np.moveaxis(np.array(rows), (0, 1), (-2, -1))
+
+
+class SimulatorBackend:
+    """Interface for statevector backends."""
+
+    name = 'base'
+
+    def statevectors(self, num_qubits: int, ops: Sequence[Tuple],
+                     batch_size: int = 1) -> np.ndarray:
+        """Final statevectors [B, 2**num_qubits] starting from |0...0>."""
+        raise NotImplementedError
+
+    def sample(self, num_qubits: int, ops: Sequence[Tuple], repetitions: int,
+               batch_size: int = 1, seed=None) -> np.ndarray:
+        """Measurement bits [B, repetitions, num_qubits] (uint8)."""
+        states = self.statevectors(num_qubits, ops, batch_size)
+        probs = np.abs(states) ** 2
+        cdf = np.cumsum(probs / probs.sum(axis=1, keepdims=True), axis=1)
+
+        rng = np.random.default_rng(seed)
+        draws = rng.random((len(states), repetitions))
+        outcomes = np.stack([
+            np.minimum(np.searchsorted(cdf[b], draws[b], side='right'), cdf.shape[1] - 1)
+            for b in range(len(states))
+        ])
+        shifts = np.arange(num_qubits - 1, -1, -1)
+        return ((outcomes[..., None] >> shifts) & 1).astype(np.uint8)
+
+
+# ============================================================================
+# NUMPY BACKEND
+# ============================================================================
+
+class NumpyBackend(SimulatorBackend):
+    """
+    Batched statevector simulator in plain NumPy.
+
+    State is a complex array [B, 2**n]. A gate list is compiled once per
+    structure (see gate_structure) into steps:
+        ('uniform',)                      leading H on every qubit
+        ('1q', qubit, gate, op_index)     H / RX / RY as a [B, left, 2, right] matmul
+        ('perm', index)                   run of CNOTs as one gather
+        ('phase', sign, rz_terms)         run of CZ / RZ as one diagonal multiply
+    Only the rotation angles are read from the gate list at run time.
+    """
+
+    name = 'numpy'
+
+    def __init__(self):
+        # LRU of compiled programs; the backend is shared by the worker threads
+        self._programs: "OrderedDict[Tuple, List[Tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def statevectors(self, num_qubits: int, ops: Sequence[Tuple],
+                     batch_size: int = 1) -> np.ndarray:
+        batch = batch_size_of(ops, batch_size)
+        state = np.zeros((batch, 2 ** num_qubits), dtype=np.complex128)
+        state[:, 0] = 1.0
+        matrices: Dict[Tuple, np.ndarray] = {}  # rotations shared by several qubits
+
+        for step in self._program(num_qubits, ops):
+            kind = step[0]
+            if kind == 'uniform':
+                state[:] = 2 ** (-num_qubits / 2)
+            elif kind == '1q':
+                _, qubit, gate, index = step
+                if gate == 'h':
+                    matrix = _H
+                else:
+                    theta = ops[index][2]
+                    key = (gate, id(theta))
+                    if key not in matrices:
+                        matrices[key] = rotation_matrix(gate, theta)
+                    matrix = matrices[key]
+                state = self._apply_1q(state, matrix, qubit, num_qubits)
+            elif kind == 'perm':
+                state = state[:, step[1]]
+            else:
+                _, sign, rz_terms = step
+                phase = 0.0
+                for index, half_z in rz_terms:
+                    theta = np.asarray(ops[index][2], dtype=np.float64)
+                    phase = phase + np.multiply.outer(np.atleast_1d(theta), half_z)
+                state = state * (sign * np.exp(1j * phase) if rz_terms else sign)
+
+        return state
+
+    def _program(self, num_qubits: int, ops: Sequence[Tuple]) -> List[Tuple]:
+        key = (num_qubits, gate_structure(ops))
+        with self._lock:
+            program = self._programs.get(key)
+            if program is not None:
+                self._programs.move_to_end(key)
+                return program
+
+        program = self._compile(num_qubits, ops)
+        with self._lock:
+            self._programs[key] = program
+            while len(self._programs) > PROGRAM_CACHE_SIZE:
+                self._programs.popitem(last=False)
+        return program
+
+    @staticmethod
+    def _compile(num_qubits: int, ops: Sequence[Tuple]) -> List[Tuple]:
+        """Fuse the fixed gates of a gate list into precomputed steps."""
+        program: List[Tuple] = []
+        start = 0
+
+        # |0...0> followed by H on every qubit is the uniform superposition
+        leading = [op[1] for op in ops[:num_qubits] if op[0] == 'h']
+        if len(leading) == num_qubits and set(leading) == set(range(num_qubits)):
+            program.append(('uniform',))
+            start = num_qubits
+
+        for index in range(start, len(ops)):
+            op = ops[index]
+            gate = op[0]
+            last = program[-1] if program else (None,)
+            if gate in ('h', 'rx', 'ry'):
+                program.append(('1q', op[1], gate, index))
+            elif gate == 'cnot':
+                # new[i] = old[perm[i]], composed with the CNOTs before it in the run
+                flipped = np.arange(2 ** num_qubits) ^ (
+                    _bits(num_qubits, op[1]) << (num_qubits - 1 - op[2])
+                )
+                if last[0] == 'perm':
+                    program[-1] = ('perm', last[1][flipped])
+                else:
+                    program.append(('perm', flipped))
+            elif gate in ('cz', 'rz'):
+                if last[0] != 'phase':
+                    last = ('phase', np.ones(2 ** num_qubits), ())
+                    program.append(last)
+                _, sign, rz_terms = last
+                if gate == 'cz':
+                    both = _bits(num_qubits, op[1]) & _bits(num_qubits, op[2])
+                    sign = sign * (1 - 2 * both)
+                else:
+                    # rz(theta) = diag(exp(-i theta / 2), exp(i theta / 2))
+                    rz_terms = rz_terms + ((index, _bits(num_qubits, op[1]) - 0.5),)
+                program[-1] = ('phase', sign, rz_terms)
+            else:
+                raise ValueError(f"Unsupported gate: {gate}")
+
+        return program
+
+    @staticmethod
+    def _apply_1q(state: np.ndarray, matrix: np.ndarray, qubit: int,
+                  num_qubits: int) -> np.ndarray:
+        """Apply a [2, 2] (shared) or [B, 2, 2] (per-batch) gate to one qubit."""
+        batch = state.shape[0]
+        # [B, left, 2, right] so the gate is a matmul on the qubit axis
+        view = state.reshape(batch, 2 ** qubit, 2, 2 ** (num_qubits - qubit - 1))
+        if matrix.ndim == 3:
+            matrix = matrix[:, None]
+        return np.matmul(matrix, view).reshape(batch, -1)
+
+
+# ============================================================================
+# CIRQ BACKEND
+# ============================================================================
+
+def to_cirq_circuit(num_qubits: int, ops: Sequence[Tuple], measure_key: str = None,
+                    qubits: Sequence = None):
+    """
+    Build a cirq.Circuit from a gate list (angles may be sympy symbols).
+    Gate list index q maps to qubits[q] (default: cirq.LineQubit.range).
+    """
+    import cirq
+
+    qubits = list(qubits) if qubits else cirq.LineQubit.range(num_qubits)
+    gates = {'rx': cirq.rx, 'ry': cirq.ry, 'rz': cirq.rz}
+    circuit = cirq.Circuit()
+    for op in ops:
+        gate = op[0]
+        if gate == 'h':
+            circuit.append(cirq.H(qubits[op[1]]))
+        elif gate in ROTATIONS:
+            circuit.append(gates[gate](op[2])(qubits[op[1]]))
+        elif gate == 'cnot':
+            circuit.append(cirq.CNOT(qubits[op[1]], qubits[op[2]]))
+        elif gate == 'cz':
+            circuit.append(cirq.CZ(qubits[op[1]], qubits[op[2]]))
+        else:
+            raise ValueError(f"Unsupported gate: {gate}")
+
+    if measure_key:
+        circuit.append(cirq.measure(*qubits, key=measure_key))
+    return circuit
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _circuit_layout(num_qubits: int, structure: Tuple, measure_key: str,
+                    qubits: Tuple) -> Tuple:
+    """
+    Moment layout for a gate structure: per moment, the fixed operations
+    (H, CNOT, CZ, measurement - immutable, so shared across calls) and
+    (op index, gate, qubit) slots for the rotations.
+    """
+    import cirq
+    import sympy
+
+    symbolic = [
+        (op[0], op[1], sympy.Symbol(f'theta_{k}')) if op[0] in ROTATIONS else op
+        for k, op in enumerate(structure)
+    ]
+    layout = []
+    for moment in to_cirq_circuit(num_qubits, symbolic, measure_key, qubits):
+        entries = []
+        for operation in moment:
+            names = cirq.parameter_names(operation)
+            if names:
+                k = int(names.pop().split('_')[1])
+                entries.append((k, structure[k][0], operation.qubits[0]))
+            else:
+                entries.append(operation)
+        layout.append(tuple(entries))
+    return tuple(layout)
+
+
+def compiled_circuit(num_qubits: int, ops: Sequence[Tuple], measure_key: str = None,
+                     qubits: Sequence = None):
+    """
+    Same circuit as to_cirq_circuit (scalar angles only), assembled from a
+    moment layout cached per (qubit count, gate structure, qubits): only
+    the rotation gates are created per call, no gate placement is redone.
+    """
+    import cirq
+
+    layout = _circuit_layout(
+        num_qubits, gate_structure(ops), measure_key, tuple(qubits) if qubits else None
+    )
+    gates = {'rx': cirq.rx, 'ry': cirq.ry, 'rz': cirq.rz}
+    return cirq.Circuit.from_moments(*(
+        cirq.Moment(
+            gates[entry[1]](float(ops[entry[0]][2]))(entry[2]) if isinstance(entry, tuple) else entry
+            for entry in moment
+        )
+        for moment in layout
+    ))
+
+
+class CirqBackend(SimulatorBackend):
+    """
+    cirq.Simulator backend.
+
+    Every rotation angle becomes a sympy symbol in a template circuit, so
+    one template serves each gate-list structure (whatever the angles);
+    the batch is evaluated with a single simulate_sweep / run_sweep over
+    a cirq.Zip.
+    """
+
+    name = 'cirq'
+
+    def __init__(self):
+        import cirq
+        self.simulator = cirq.Simulator()
+        # LRU of symbolic templates, keyed by structure only
+        self._templates: "OrderedDict[Tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _template(self, num_qubits: int, ops: Sequence[Tuple], measure_key: str = None):
+        """(template circuit, sweep, batch size) for a gate list."""
+        import cirq
+        import sympy
+
+        structure = gate_structure(ops)
+        key = (num_qubits, measure_key, structure)
+        with self._lock:
+            circuit = self._templates.get(key)
+            if circuit is not None:
+                self._templates.move_to_end(key)
+
+        if circuit is None:
+            symbolic = [
+                (op[0], op[1], sympy.Symbol(f'theta_{k}')) if op[0] in ROTATIONS else op
+                for k, op in enumerate(structure)
+            ]
+            circuit = to_cirq_circuit(num_qubits, symbolic, measure_key)
+            with self._lock:
+                self._templates[key] = circuit
+                while len(self._templates) > TEMPLATE_CACHE_SIZE:
+                    self._templates.popitem(last=False)
+
+        rotations = [k for k, op in enumerate(ops) if op[0] in ROTATIONS]
+        if not rotations:
+            return circuit, cirq.UnitSweep, 1
+        # Scalar angles are repeated across the batch
+        batch = batch_size_of(ops)
+        sweep = cirq.Zip(*[
+            cirq.Points(f'theta_{k}', np.broadcast_to(
+                np.asarray(ops[k][2], dtype=np.float64), (batch,)
+            ).tolist())
+            for k in rotations
+        ])
+        return circuit, sweep, batch
+
+    def statevectors(self, num_qubits: int, ops: Sequence[Tuple],
+                     batch_size: int = 1) -> np.ndarray:
+        import cirq
+
+        circuit, sweep, batch = self._template(num_qubits, ops)
+        results = self.simulator.simulate_sweep(
+            circuit, params=sweep, qubit_order=cirq.LineQubit.range(num_qubits)
+        )
+        states = np.stack([r.final_state_vector for r in results])
+        if batch == 1 and batch_size > 1:
+            states = np.repeat(states, batch_size, axis=0)
+        return states
+
+    def sample(self, num_qubits: int, ops: Sequence[Tuple], repetitions: int,
+               batch_size: int = 1, seed=None) -> np.ndarray:
+        import cirq
+
+        circuit, sweep, batch = self._template(num_qubits, ops, measure_key='m')
+        # A shared circuit is sampled once with all batches' repetitions
+        copies = batch_size if batch == 1 else 1
+        # Seeded runs get their own simulator so the shared one stays unseeded
+        simulator = self.simulator if seed is None else cirq.Simulator(
+            seed=int(seed) if isinstance(seed, (int, np.integer)) else seed
+        )
+        results = simulator.run_sweep(
+            circuit, params=sweep, repetitions=repetitions * copies
+        )
+        bits = np.stack([r.measurements['m'] for r in results]).astype(np.uint8)
+        return bits.reshape(batch * copies, repetitions, num_qubits)
+
+
+BACKENDS = {'numpy': NumpyBackend, 'cirq': CirqBackend}
+
+
+def get_backend(backend: Union[str, SimulatorBackend, None] = None) -> SimulatorBackend:
+    """Resolve a backend name ('numpy', 'cirq') or instance; default 'cirq'."""
+    if isinstance(backend, SimulatorBackend):
+        return backend
+    name = backend or 'cirq'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown simulator backend '{name}' (choose from {sorted(BACKENDS)})")
+    return BACKENDS[name]()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict
 
 @dataclass
@@ -10,6 +10,7 @@ class AgentConfig:
     village_name: str
     location: tuple  # (lat, lon)
     population: int
+    aliases: List[str] = field(default_factory=list)  # Alternate/local-language names
     
     # Gemini Model Settings
     model_name: str = "gemini-1.5-pro"
@@ -25,6 +26,14 @@ class AgentConfig:
     consensus_threshold: float = 0.66  # 2/3 majority
     min_votes_required: int = 2
     
+    # Belief Formula (see swarm/agents/belief_engine.py)
+    belief_history_weight: float = 0.4
+    belief_anomaly_weight: float = 0.4
+    belief_neighbor_weight: float = 0.2
+    anomaly_window: int = 5        # Recent reports counted for anomalies
+    history_saturation: int = 10   # Reports at which history factor maxes out
+    history_capacity: int = 50     # Ring buffer size for symptom history
+    
     # Privacy Settings
     anonymize_data: bool = True
     share_only_aggregated: bool = True
@@ -39,24 +48,28 @@ VILLAGE_CONFIGS = {
         village_id='v1',
         village_name='Dharavi',
         location=(19.04, 72.86),
-        population=700000
+        population=700000,
+        aliases=['धारावी', 'dharavee']
     ),
     'v2': AgentConfig(
         village_id='v2',
         village_name='Kalyan',
         location=(19.24, 73.14),
-        population=150000
+        population=150000,
+        aliases=['कल्याण', 'kalyaan']
     ),
     'v3': AgentConfig(
         village_id='v3',
         village_name='Thane',
         location=(19.22, 72.97),
-        population=180000
+        population=180000,
+        aliases=['ठाणे', 'thana']
     ),
     'v4': AgentConfig(
         village_id='v4',
         village_name='Navi Mumbai',
         location=(19.03, 73.01),
-        population=120000
+        population=120000,
+        aliases=['नवी मुंबई', 'new bombay']
     )
 }
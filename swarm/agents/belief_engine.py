@@ -0,0 +1,74 @@
+"""
+Incremental Belief Engine
+
+Constant-time outbreak belief updates for a village agent.
+NO LLM - same weighted formula as before, maintained incrementally:
+
+    belief = w_history * min(reports / saturation, 1)
+           + w_anomaly * recent_anomalies / window
+           + w_neighbor * mean(neighbor_beliefs)
+
+The sliding-window anomaly count comes from SymptomHistory; the
+neighbor mean is kept as a running sum updated when a belief changes.
+"""
+
+from typing import Dict
+
+
+class BeliefEngine:
+    """Weighted belief formula with a running neighbor-belief sum."""
+
+    def __init__(self, history_weight: float = 0.4, anomaly_weight: float = 0.4,
+                 neighbor_weight: float = 0.2, anomaly_window: int = 5,
+                 history_saturation: int = 10):
+        self.history_weight = history_weight
+        self.anomaly_weight = anomaly_weight
+        self.neighbor_weight = neighbor_weight
+        self.anomaly_window = anomaly_window
+        self.history_saturation = history_saturation
+
+        # Read-only for callers - update through set_neighbor_belief()
+        self.neighbor_beliefs: Dict[str, float] = {}
+        self._neighbor_sum: float = 0.0
+
+    @classmethod
+    def from_config(cls, config) -> "BeliefEngine":
+        """Build engine from an AgentConfig."""
+        return cls(
+            history_weight=config.belief_history_weight,
+            anomaly_weight=config.belief_anomaly_weight,
+            neighbor_weight=config.belief_neighbor_weight,
+            anomaly_window=config.anomaly_window,
+            history_saturation=config.history_saturation
+        )
+
+    def set_neighbor_belief(self, neighbor_id: str, belief: float):
+        """Record a neighbor's belief, adjusting the running sum."""
+        previous = self.neighbor_beliefs.get(neighbor_id)
+        if previous is not None:
+            self._neighbor_sum -= previous
+        self.neighbor_beliefs[neighbor_id] = belief
+        self._neighbor_sum += belief
+
+    def remove_neighbor(self, neighbor_id: str):
+        """Forget a neighbor (e.g. agent removed from the swarm)."""
+        previous = self.neighbor_beliefs.pop(neighbor_id, None)
+        if previous is not None:
+            self._neighbor_sum -= previous
+
+    @property
+    def neighbor_factor(self) -> float:
+        if not self.neighbor_beliefs:
+            return 0.0
+        return self._neighbor_sum / len(self.neighbor_beliefs)
+
+    def compute(self, report_count: int, recent_anomalies: int) -> float:
+        """Combined belief from O(1) aggregates."""
+        history_factor = min(report_count / float(self.history_saturation), 1.0)
+        anomaly_factor = recent_anomalies / float(self.anomaly_window)
+
+        return (
+            self.history_weight * history_factor +
+            self.anomaly_weight * anomaly_factor +
+            self.neighbor_weight * self.neighbor_factor
+        )
@@ -0,0 +1,135 @@
+"""
+Bounded Symptom History
+
+Fixed-capacity ring buffer for a village agent's symptom reports.
+Keeps rolling aggregates as numeric arrays so belief updates and
+status queries never rescan the history.
+
+Raw report payloads (metadata, Gemini edge analysis) are NOT kept in
+agent memory - with a cold store configured (swarm.history.cold_store_path)
+each report is written there in full when it arrives, so records the ring
+later evicts remain recoverable.
+"""
+
+from typing import Dict, List, Optional, Sequence
+from datetime import datetime
+import json
+import os
+import numpy as np
+
+DEFAULT_CAPACITY = 50       # matches adk.agents.default_memory_size
+DEFAULT_ANOMALY_WINDOW = 5  # reports considered "recent" for belief updates
+
+
+class JsonlColdStore:
+    """Append-only JSON Lines store for raw symptom reports."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def append(self, record: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+
+class SymptomHistory:
+    """
+    Ring buffer of compact symptom report records.
+
+    Per report only the symptom tuple, anomaly flag, anomaly score and
+    timestamp are retained. Aggregates are updated on append in O(1):
+    - total_count: reports ever received
+    - recent_anomalies: anomalies within the last `anomaly_window` reports
+    - symptom counters: per-symptom totals over a fixed vocabulary
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY,
+                 anomaly_window: int = DEFAULT_ANOMALY_WINDOW,
+                 vocabulary: Sequence[str] = (),
+                 cold_store=None):
+        if capacity < anomaly_window:
+            raise ValueError("capacity must be >= anomaly_window")
+
+        self.capacity = capacity
+        self.anomaly_window = anomaly_window
+        self.cold_store = cold_store
+
+        # Ring storage
+        self._symptoms: List[Optional[tuple]] = [None] * capacity
+        self._anomaly = np.zeros(capacity, dtype=bool)
+        self._score = np.zeros(capacity, dtype=np.float32)
+        self._timestamp = np.zeros(capacity, dtype=np.float64)
+        self._head = 0  # next write position
+
+        # Rolling aggregates
+        self.total_count: int = 0
+        self.recent_anomalies: int = 0
+
+        # Per-symptom counters (last slot = untracked symptoms)
+        self.vocabulary = [s.lower() for s in vocabulary]
+        self._symptom_index = {s: i for i, s in enumerate(self.vocabulary)}
+        self._symptom_counts = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.total_count
+
+    def append(self, symptoms: List[str], analysis: Dict, metadata: Dict = None):
+        """Record a report and update rolling aggregates."""
+        now = datetime.now()
+        symptoms_lower = tuple(s.lower().strip() for s in symptoms)
+        is_anomaly = bool(analysis.get('anomaly_detected', False))
+
+        # Slide the anomaly window: drop the flag leaving the window
+        if self.total_count >= self.anomaly_window:
+            leaving = (self._head - self.anomaly_window) % self.capacity
+            self.recent_anomalies -= int(self._anomaly[leaving])
+        self.recent_anomalies += int(is_anomaly)
+
+        pos = self._head
+        self._symptoms[pos] = symptoms_lower
+        self._anomaly[pos] = is_anomaly
+        self._score[pos] = analysis.get('anomaly_score', 0.0)
+        self._timestamp[pos] = now.timestamp()
+        self._head = (pos + 1) % self.capacity
+        self.total_count += 1
+
+        other = len(self.vocabulary)
+        for s in set(symptoms_lower):
+            self._symptom_counts[self._symptom_index.get(s, other)] += 1
+
+        if self.cold_store is not None:
+            self.cold_store.append({
+                'symptoms': list(symptoms),
+                'metadata': metadata or {},
+                'timestamp': now.isoformat(),
+                **analysis
+            })
+
+    def symptom_counts(self) -> Dict[str, int]:
+        """Per-symptom report counts (non-zero only)."""
+        counts = {
+            s: int(self._symptom_counts[i])
+            for i, s in enumerate(self.vocabulary)
+            if self._symptom_counts[i]
+        }
+        if self._symptom_counts[-1]:
+            counts['other'] = int(self._symptom_counts[-1])
+        return counts
+
+    def recent(self, n: int = None) -> List[Dict]:
+        """Return up to `n` most recent compact records, oldest first."""
+        size = min(self.total_count, self.capacity)
+        n = size if n is None else min(n, size)
+
+        records = []
+        for k in range(n, 0, -1):
+            pos = (self._head - k) % self.capacity
+            records.append({
+                'symptoms': list(self._symptoms[pos]),
+                'anomaly_detected': bool(self._anomaly[pos]),
+                'anomaly_score': round(float(self._score[pos]), 3),
+                'timestamp': datetime.fromtimestamp(self._timestamp[pos]).isoformat()
+            })
+        return records
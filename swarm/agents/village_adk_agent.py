@@ -10,10 +10,15 @@ Gemini is ONLY used in edge/gemini_processor.py for:
 - Language translation
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import asyncio
 
+from swarm.agents.symptom_history import SymptomHistory
+from swarm.agents.belief_engine import BeliefEngine
+from swarm.agents.agent_config import AgentConfig, VILLAGE_CONFIGS
+from swarm.utils.adk_helpers import gather_with_timeout
+
 # ============================================================================
 # Configuration Thresholds
 # ============================================================================
@@ -40,24 +45,74 @@ class VillageSwarmAgent:
     """
     
     def __init__(self, village_id: str, village_name: str, location: tuple,
-                 orchestrator=None, quantum_service=None):
+                 orchestrator=None, quantum_service=None, cold_store=None,
+                 config: AgentConfig = None):
         self.village_id = village_id
         self.village_name = village_name
         self.location = location
         self.orchestrator = orchestrator
         self.quantum_service = quantum_service
+        self.config = config
+        self.aliases: List[str] = list(config.aliases) if config else []
+        
+        # Belief formula (weights/window configurable per agent)
+        self.belief_engine = BeliefEngine.from_config(config) if config else BeliefEngine()
+        
+        # Agent state (bounded history - raw payloads go to cold_store)
+        self.symptom_history = SymptomHistory(
+            capacity=config.history_capacity if config else 50,
+            anomaly_window=self.belief_engine.anomaly_window,
+            vocabulary=THRESHOLDS['high_risk_symptoms'] + THRESHOLDS['medium_risk_symptoms'],
+            cold_store=cold_store
+        )
+        # Optional array-backed state (vectorized mode, see bind_state)
+        self._state = None
+        self._state_index: int = None
         
-        # Agent state
-        self.symptom_history: List[Dict] = []
-        self.outbreak_belief: float = 0.0
-        self.risk_level: str = "normal"
+        self.outbreak_belief = 0.0
+        self.risk_level = "normal"
         self.last_analysis: datetime = None
         
         # Communication state
-        self.neighbor_beliefs: Dict[str, float] = {}
         self.pending_votes: Dict[str, str] = {}
         self.messages_received: List[Dict] = []
 
+    # ========================================================================
+    # STATE STORAGE (local attributes or a row of VectorizedSwarmState)
+    # ========================================================================
+    
+    def bind_state(self, state, index: int):
+        """Make this agent a view over row `index` of a VectorizedSwarmState."""
+        belief, risk = self.outbreak_belief, self.risk_level
+        self._state, self._state_index = state, index
+        self.outbreak_belief, self.risk_level = belief, risk
+    
+    @property
+    def outbreak_belief(self) -> float:
+        if self._state is None:
+            return self._outbreak_belief
+        return float(self._state.belief[self._state_index])
+    
+    @outbreak_belief.setter
+    def outbreak_belief(self, value: float):
+        if self._state is None:
+            self._outbreak_belief = value
+        else:
+            self._state.belief[self._state_index] = value
+    
+    @property
+    def risk_level(self) -> str:
+        if self._state is None:
+            return self._risk_level
+        return self._state.risk_level(self._state_index)
+    
+    @risk_level.setter
+    def risk_level(self, value: str):
+        if self._state is None:
+            self._risk_level = value
+        else:
+            self._state.set_risk_level(self._state_index, value)
+
     # ========================================================================
     # CORE ANALYSIS (Simple Math - NO LLM)
     # ========================================================================
@@ -90,29 +145,21 @@ class VillageSwarmAgent:
             "total_symptoms": len(symptoms_lower)
         }
     
+    @property
+    def neighbor_beliefs(self) -> Dict[str, float]:
+        """Latest known neighbor beliefs (maintained by the belief engine)."""
+        return self.belief_engine.neighbor_beliefs
+    
     def update_belief(self) -> float:
         """
         Update outbreak belief using Bayesian-like update.
-        Simple math formula - NO LLM.
+        Simple math formula - NO LLM. O(1) per report:
+        history size, recent anomalies and neighbor mean are all
+        maintained incrementally.
         """
-        # Base belief from symptom history
-        history_factor = min(len(self.symptom_history) / 10.0, 1.0)
-        
-        # Recent anomaly factor (last 5 reports)
-        recent = self.symptom_history[-5:] if self.symptom_history else []
-        anomaly_count = sum(1 for r in recent if r.get('anomaly_detected', False))
-        anomaly_factor = anomaly_count / 5.0 if recent else 0
-        
-        # Neighbor influence (swarm behavior)
-        neighbor_factor = 0
-        if self.neighbor_beliefs:
-            neighbor_factor = sum(self.neighbor_beliefs.values()) / len(self.neighbor_beliefs)
-        
-        # Combined belief (weighted average)
-        self.outbreak_belief = (
-            0.4 * history_factor +
-            0.4 * anomaly_factor +
-            0.2 * neighbor_factor
+        self.outbreak_belief = self.belief_engine.compute(
+            self.symptom_history.total_count,
+            self.symptom_history.recent_anomalies
         )
         
         # Update risk level based on belief
@@ -151,15 +198,15 @@ class VillageSwarmAgent:
         analysis = self.analyze_symptoms(symptoms)
         
         # Store in history
-        self.symptom_history.append({
-            'symptoms': symptoms,
-            'metadata': metadata,
-            'timestamp': datetime.now().isoformat(),
-            **analysis
-        })
+        self.symptom_history.append(symptoms, analysis, metadata)
+        if self._state is not None:
+            self._state.record_report(self._state_index, analysis['anomaly_detected'])
         
         # Step 2: Update belief (Bayesian-like formula)
+        previous_belief, previous_risk = self.outbreak_belief, self.risk_level
         self.update_belief()
+        if self.orchestrator:
+            self.orchestrator.notify_agent_update(self, previous_belief, previous_risk)
         
         # Step 3: Decide actions based on thresholds
         actions_taken = []
@@ -170,25 +217,31 @@ class VillageSwarmAgent:
             actions_taken.append("queried_neighbors")
         
         # Rule: If belief > quantum threshold, check consensus then escalate
+        quantum_fields = {}
         if self.outbreak_belief >= THRESHOLDS['escalate_to_quantum']:
             consensus = self._check_consensus()
             if consensus:
-                await self._escalate_to_quantum()
-                actions_taken.append("escalated_to_quantum")
+                quantum_fields = self._escalate_to_quantum()
+                # Only claim an escalation if a job or result actually came back
+                actions_taken.append(
+                    "escalated_to_quantum" if quantum_fields else "escalation_unavailable"
+                )
             else:
                 await self._propose_escalation()
                 actions_taken.append("proposed_escalation")
         
         self.last_analysis = datetime.now()
         
-        return {
+        response = {
             "village": self.village_name,
             "analysis": analysis,
             "outbreak_belief": round(self.outbreak_belief, 3),
             "risk_level": self.risk_level,
             "actions_taken": actions_taken,
-            "symptom_count": len(self.symptom_history)
+            "symptom_count": self.symptom_history.total_count
         }
+        response.update(quantum_fields)
+        return response
 
     # ========================================================================
     # INTER-AGENT COMMUNICATION (Swarm Behavior)
@@ -201,15 +254,23 @@ class VillageSwarmAgent:
         
         neighbors = self.orchestrator.network_topology.get(self.village_id, [])
         
-        for neighbor_id in neighbors:
-            try:
-                response = await self.orchestrator.query_agent(
+        # Fan out to all neighbors at once - one round trip, not N.
+        # Neighbors that fail or time out keep their last known belief.
+        responses, _ = await gather_with_timeout(
+            {
+                neighbor_id: self.orchestrator.query_agent(
                     neighbor_id, "status", {"from": self.village_id}
                 )
-                if response and 'outbreak_belief' in response:
-                    self.neighbor_beliefs[neighbor_id] = response['outbreak_belief']
-            except Exception:
-                pass
+                for neighbor_id in neighbors
+            },
+            timeout=self.orchestrator.query_timeout
+        )
+        
+        for neighbor_id, response in responses.items():
+            if response and 'outbreak_belief' in response:
+                self.belief_engine.set_neighbor_belief(
+                    neighbor_id, response['outbreak_belief']
+                )
     
     async def _propose_escalation(self):
         """Propose quantum escalation to neighbors for voting."""
@@ -246,15 +307,33 @@ class VillageSwarmAgent:
         
         return consensus_ratio >= THRESHOLDS['consensus_required']
     
-    async def _escalate_to_quantum(self):
-        """Trigger quantum analysis."""
-        if self.quantum_service:
-            try:
-                # Gather swarm data for quantum analysis
-                swarm_data = self.orchestrator.get_network_status() if self.orchestrator else {}
-                await self.quantum_service.detect_outbreak_pattern(swarm_data)
-            except Exception:
-                pass
+    def _escalate_to_quantum(self) -> Dict:
+        """
+        Quantum analysis of the current swarm snapshot without waiting on
+        the report path. Returns response fields:
+        - 'quantum_analysis' if a result already exists (cached analysis
+          or an equivalent job that has finished)
+        - 'quantum_job' (job_id, status_url) if a background job was queued
+        Empty if no job queue is available.
+        """
+        jobs = self.orchestrator.quantum_jobs if self.orchestrator else None
+        if not (self.quantum_service and jobs):
+            return {}
+        
+        swarm_data = self.orchestrator.get_network_status()
+        cached = self.quantum_service.cached_analysis(swarm_data)
+        if cached is not None:
+            return {"quantum_analysis": cached}
+        
+        # Same snapshot (as the result cache sees it) -> same job
+        job, coalesced = jobs.submit(
+            'pattern_detection', self.quantum_service.analysis_key(swarm_data),
+            lambda: self.quantum_service.detect_outbreak_pattern(swarm_data)
+        )
+        fields = {"quantum_job": jobs.summary(job, coalesced)}
+        if job['status'] == 'completed':
+            fields["quantum_analysis"] = job['result']
+        return fields
 
     # ========================================================================
     # MESSAGE HANDLING (Swarm Communication)
@@ -273,7 +352,7 @@ class VillageSwarmAgent:
             "village": self.village_name,
             "outbreak_belief": self.outbreak_belief,
             "risk_level": self.risk_level,
-            "symptom_count": len(self.symptom_history),
+            "symptom_count": self.symptom_history.total_count,
             "anomaly_detected": self.risk_level in ['high', 'critical']
         }
     
@@ -305,7 +384,8 @@ class VillageSwarmAgent:
             "location": self.location,
             "outbreak_belief": self.outbreak_belief,
             "risk_level": self.risk_level,
-            "symptom_count": len(self.symptom_history),
+            "symptom_count": self.symptom_history.total_count,
+            "symptom_breakdown": self.symptom_history.symptom_counts(),
             "neighbor_beliefs": self.neighbor_beliefs,
             "last_analysis": self.last_analysis.isoformat() if self.last_analysis else None
         }
@@ -315,18 +395,21 @@ class VillageSwarmAgent:
 # FACTORY FUNCTION
 # ============================================================================
 
-def create_village_agents(orchestrator=None, quantum_service=None) -> Dict[str, VillageSwarmAgent]:
-    """Create all village swarm agents."""
-    villages = [
-        ("v1", "Dharavi", (19.04, 72.86)),
-        ("v2", "Kalyan", (19.24, 73.14)),
-        ("v3", "Thane", (19.22, 72.97)),
-        ("v4", "Navi Mumbai", (19.03, 73.01))
-    ]
+def create_village_agents(orchestrator=None, quantum_service=None, cold_store=None,
+                          configs: Dict[str, AgentConfig] = None) -> Dict[str, VillageSwarmAgent]:
+    """
+    Create village swarm agents.
+    
+    Args:
+        configs: village_id -> AgentConfig; defaults to VILLAGE_CONFIGS
+    """
+    configs = configs or VILLAGE_CONFIGS
     
     agents = {}
-    for vid, vname, location in villages:
-        agents[vid] = VillageSwarmAgent(vid, vname, location, orchestrator, quantum_service)
+    for vid, config in configs.items():
+        agents[vid] = VillageSwarmAgent(vid, config.village_name, config.location,
+                                        orchestrator, quantum_service, cold_store,
+                                        config=config)
     
     return agents
 
@@ -0,0 +1,62 @@
+"""
+Communication Log (Ring Buffer)
+
+Fixed-capacity log of inter-agent messages for frontend visibility.
+Every entry gets a monotonic sequence number so clients can poll with
+a cursor (`since=<seq>`) and only fetch messages they have not seen.
+"""
+
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List
+
+DEFAULT_LOG_SIZE = 100
+
+
+class CommunicationLog:
+    """Ring buffer of message entries with monotonic `seq` numbers."""
+
+    def __init__(self, capacity: int = DEFAULT_LOG_SIZE):
+        self._entries = deque(maxlen=capacity)
+        self.last_seq: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def capacity(self) -> int:
+        return self._entries.maxlen
+
+    def append(self, from_agent: str, to_agent: str, msg_type: str, content: Dict) -> Dict:
+        """Add a message; the oldest entry is dropped once full."""
+        self.last_seq += 1
+        entry = {
+            "seq": self.last_seq,
+            "timestamp": datetime.now().isoformat(),
+            "from": from_agent,
+            "to": to_agent,
+            "type": msg_type,
+            "content": content
+        }
+        self._entries.append(entry)
+        return entry
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        """Last `limit` entries, oldest first."""
+        if limit <= 0:
+            return []
+        newest_first = list(islice(reversed(self._entries), limit))
+        newest_first.reverse()
+        return newest_first
+
+    def since(self, seq: int, limit: int = 50) -> List[Dict]:
+        """
+        Entries with sequence number > `seq`, oldest first, at most `limit`.
+
+        Cost is proportional to the number of new entries, not the log size.
+        Entries already evicted from the ring are silently skipped.
+        """
+        newer = min(max(self.last_seq - seq, 0), len(self._entries))
+        entries = self.recent(newer)
+        return entries[:limit]
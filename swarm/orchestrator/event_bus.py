@@ -0,0 +1,76 @@
+"""
+Swarm Event Bus
+
+In-process fan-out of swarm events (communications, agent belief/risk
+changes) to many subscribers, e.g. Server-Sent Events clients.
+
+Publishing never blocks: each subscriber has a bounded queue, and a
+slow subscriber loses its oldest events instead of stalling the swarm.
+The number of dropped events is reported so clients can resync.
+
+Must be used from the event loop thread (asyncio.Queue is not thread-safe).
+"""
+
+from typing import Dict, Set
+import asyncio
+
+DEFAULT_QUEUE_SIZE = 256
+
+
+class Subscription:
+    """A subscriber's bounded event queue."""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped: int = 0  # events lost since last reported
+
+    def push(self, event: Dict):
+        if self.queue.full():
+            # Backpressure: drop the oldest event for this subscriber only
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict:
+        return await self.queue.get()
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class EventBus:
+    """Publish/subscribe hub for swarm events."""
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self.published: int = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, data: Dict, event_id: int = None):
+        """Deliver an event to every subscriber without blocking."""
+        self.published += 1
+        if not self._subscribers:
+            return
+
+        event = {"type": event_type, "data": data, "id": event_id}
+        for subscription in list(self._subscribers):
+            subscription.push(event)
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published
+        }
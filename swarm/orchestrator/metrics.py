@@ -0,0 +1,140 @@
+"""
+Swarm Metrics (Streaming Aggregates)
+
+Running totals for the analytics dashboard, updated as reports arrive
+instead of recomputed from every agent on each request:
+- total reports and villages
+- villages per risk level
+- average outbreak belief
+- report rates over sliding 1h / 24h / 7d windows
+
+Every read and update is O(1) in the number of villages.
+"""
+
+from typing import Dict
+import time
+
+RISK_LEVELS = ('normal', 'low', 'medium', 'high', 'critical')
+HIGH_RISK_LEVELS = ('high', 'critical')
+
+# Window name -> seconds
+REPORT_RATE_WINDOWS = {'1h': 3600, '24h': 86400, '7d': 604800}
+WINDOW_BUCKETS = 60
+
+
+def _belief_millis(belief: float) -> int:
+    """Belief as integer thousandths (the 3-decimal value the API reports)."""
+    return int(round(round(belief, 3) * 1000))
+
+
+class RollingCounter:
+    """
+    Event count over a sliding time window, kept in fixed-width buckets.
+
+    The window advances one bucket at a time, so counts are exact to
+    within one bucket width (span / buckets).
+    """
+
+    def __init__(self, span: float, buckets: int = WINDOW_BUCKETS):
+        self.width = span / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self._bucket: int = None  # absolute index of the newest bucket
+
+    def _advance(self, now: float):
+        bucket = int(now // self.width)
+        if self._bucket is None:
+            self._bucket = bucket
+            return
+        # Clear the buckets that slid out of the window (at most all of them)
+        for b in range(self._bucket + 1, min(bucket, self._bucket + len(self.counts)) + 1):
+            slot = b % len(self.counts)
+            self.total -= self.counts[slot]
+            self.counts[slot] = 0
+        self._bucket = max(self._bucket, bucket)
+
+    def add(self, count: int = 1, now: float = None):
+        now = time.time() if now is None else now
+        self._advance(now)
+        self.counts[int(now // self.width) % len(self.counts)] += count
+        self.total += count
+
+    def value(self, now: float = None) -> int:
+        self._advance(time.time() if now is None else now)
+        return self.total
+
+
+class SwarmMetrics:
+    """Aggregate swarm counters maintained incrementally."""
+
+    def __init__(self, windows: Dict[str, float] = None):
+        self.village_count: int = 0
+        self.total_reports: int = 0
+        self.risk_counts: Dict[str, int] = {level: 0 for level in RISK_LEVELS}
+        self._belief_millis_sum: int = 0
+        self.report_rates = {
+            name: RollingCounter(span)
+            for name, span in (windows or REPORT_RATE_WINDOWS).items()
+        }
+
+    # ========================================================================
+    # UPDATES
+    # ========================================================================
+
+    def add_village(self, belief: float, risk_level: str, report_count: int = 0):
+        self.village_count += 1
+        self.total_reports += report_count
+        self.risk_counts[risk_level] += 1
+        self._belief_millis_sum += _belief_millis(belief)
+
+    def remove_village(self, belief: float, risk_level: str, report_count: int = 0):
+        self.village_count -= 1
+        self.total_reports -= report_count
+        self.risk_counts[risk_level] -= 1
+        self._belief_millis_sum -= _belief_millis(belief)
+
+    def update_village(self, previous_belief: float, belief: float,
+                       previous_risk: str, risk_level: str):
+        """A village's belief and/or risk level changed."""
+        self._belief_millis_sum += _belief_millis(belief) - _belief_millis(previous_belief)
+        if previous_risk != risk_level:
+            self.risk_counts[previous_risk] -= 1
+            self.risk_counts[risk_level] += 1
+
+    def record_report(self, count: int = 1, now: float = None):
+        """Count incoming reports (total and sliding windows)."""
+        self.total_reports += count
+        for counter in self.report_rates.values():
+            counter.add(count, now)
+
+    def set_distribution(self, belief_millis_sum: int, risk_counts: Dict[str, int]):
+        """Replace belief sum and risk histogram, e.g. after batched propagation."""
+        self._belief_millis_sum = int(belief_millis_sum)
+        self.risk_counts = {level: int(risk_counts.get(level, 0)) for level in RISK_LEVELS}
+
+    # ========================================================================
+    # READS
+    # ========================================================================
+
+    @property
+    def high_risk_villages(self) -> int:
+        return sum(self.risk_counts[level] for level in HIGH_RISK_LEVELS)
+
+    @property
+    def average_belief(self) -> float:
+        if not self.village_count:
+            return 0
+        return self._belief_millis_sum / 1000 / self.village_count
+
+    def snapshot(self, now: float = None) -> Dict:
+        """Current aggregate values for the dashboard."""
+        return {
+            'active_villages': self.village_count,
+            'total_reports': self.total_reports,
+            'high_risk_villages': self.high_risk_villages,
+            'average_outbreak_belief': self.average_belief,
+            'risk_distribution': dict(self.risk_counts),
+            'report_rates': {
+                name: counter.value(now) for name, counter in self.report_rates.items()
+            }
+        }
@@ -9,9 +9,24 @@ Manages village agents and enables swarm intelligence through:
 NO LLM calls - pure rule-based coordination.
 """
 
-from typing import Dict, List
-from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping
 import asyncio
+import uuid
+import numpy as np
+
+from swarm.agents.symptom_history import JsonlColdStore
+from swarm.utils.adk_helpers import gather_with_timeout
+from swarm.utils.config_loader import get_adk_setting, load_config
+from swarm.orchestrator.topology import load_swarm_topology
+from swarm.orchestrator.communication_log import CommunicationLog, DEFAULT_LOG_SIZE
+from swarm.orchestrator.event_bus import EventBus, DEFAULT_QUEUE_SIZE
+from swarm.orchestrator.metrics import SwarmMetrics
+
+
+def _index_key(name: str) -> str:
+    """Normalize a village id/name/alias for lookup ('Navi Mumbai' -> 'navi_mumbai')."""
+    return name.strip().lower().replace(' ', '_')
 
 
 class SwarmOrchestrator:
@@ -20,20 +35,63 @@ class SwarmOrchestrator:
     Uses simple message passing and voting - NO LLM.
     """
     
-    def __init__(self, quantum_service=None):
+    def __init__(self, quantum_service=None, vectorized: bool = None,
+                 swarm_config: Dict = None, quantum_jobs=None):
         self.quantum_service = quantum_service
+        # Background job queue for agent escalations (QuantumJobManager);
+        # without one, agents do not run quantum analysis on the report path
+        self.quantum_jobs = quantum_jobs
         self.agents: Dict[str, any] = {}
         
-        # Communication log for frontend visibility
-        self.communication_log: List[Dict] = []
+        # Name/alias index: normalized key -> village_id (kept in sync on register)
+        self._name_index: Dict[str, str] = {}
+        self._index_keys_by_agent: Dict[str, set] = {}
         
-        # Network topology (which villages are neighbors)
-        self.network_topology: Dict[str, List[str]] = {
-            'v1': ['v2', 'v3'],        # Dharavi ↔ Kalyan, Thane
-            'v2': ['v1', 'v3'],        # Kalyan ↔ Dharavi, Thane
-            'v3': ['v1', 'v2', 'v4'],  # Thane ↔ all
-            'v4': ['v3']               # Navi Mumbai ↔ Thane
-        }
+        # Per-agent deadline for fan-out queries and votes (adk.tools.timeout)
+        self.query_timeout: float = get_adk_setting('tools.timeout', 30)
+        
+        if swarm_config is None:
+            swarm_config = load_config('swarm_config')
+        
+        # Vectorized mode: agent state lives in shared NumPy arrays
+        # (swarm.vectorized unless overridden by the caller)
+        if vectorized is None:
+            vectorized = bool(swarm_config.get('swarm', {}).get('vectorized', False))
+        self.vectorized = vectorized
+        self.vector_state = None
+        
+        # Communication log for frontend visibility (ring buffer)
+        communication = swarm_config.get('swarm', {}).get('communication', {})
+        self.communication_log = CommunicationLog(
+            capacity=communication.get('log_size', DEFAULT_LOG_SIZE)
+        )
+        
+        # Live event fan-out (communications + agent belief/risk deltas)
+        self.events = EventBus(
+            queue_size=communication.get('stream_queue_size', DEFAULT_QUEUE_SIZE)
+        )
+        
+        # Villages and network topology (which villages are neighbors),
+        # loaded from config/swarm_config.yaml (+ optional registry)
+        self.village_configs, self.network_topology = load_swarm_topology(swarm_config)
+        
+        # Versioned network status snapshot: per-agent entries are rebuilt
+        # only when that agent changes; the top-level view is rebuilt lazily
+        # when the version has moved. The ETag embeds a per-process id so
+        # versions from a restarted server never collide.
+        self.status_version: int = 0
+        self._status_instance = uuid.uuid4().hex[:8]
+        self._status_entries: Dict[str, Mapping] = {}
+        self._status_snapshot: Mapping = None
+        self._snapshot_version: int = -1
+        self._frozen_topology: Mapping = None
+        
+        # Dashboard aggregates, updated per report (see notify_agent_update)
+        self.metrics = SwarmMetrics()
+        
+        # Optional cold store for raw report payloads (agents keep compact history)
+        cold_store_path = swarm_config.get('swarm', {}).get('history', {}).get('cold_store_path')
+        self.cold_store = JsonlColdStore(cold_store_path) if cold_store_path else None
         
         self._initialize_swarm()
     
@@ -41,40 +99,228 @@ class SwarmOrchestrator:
         """Create village agents."""
         from swarm.agents.village_adk_agent import create_village_agents
         
-        self.agents = create_village_agents(
+        agents = create_village_agents(
             orchestrator=self,
-            quantum_service=self.quantum_service
+            quantum_service=self.quantum_service,
+            cold_store=self.cold_store,
+            configs=self.village_configs
         )
+        for agent in agents.values():
+            self.register_agent(agent)
         
-        print(f"✓ Swarm initialized: {len(self.agents)} rule-based agents")
+        if self.vectorized:
+            from swarm.orchestrator.vectorized_swarm import VectorizedSwarmState
+            self.vector_state = VectorizedSwarmState.from_agents(
+                self.agents, self.network_topology
+            )
+        
+        print(f"✓ Swarm initialized: {len(self.agents)} rule-based agents"
+              f"{' (vectorized)' if self.vectorized else ''}")
+    
+    def propagate_beliefs(self, steps: int = 1) -> Dict:
+        """
+        Batched belief propagation over the whole network (vectorized mode).
+        One sparse matrix-vector product per step - NO per-agent loop.
+        """
+        if self.vector_state is None:
+            raise RuntimeError("propagate_beliefs() requires vectorized=True")
+        
+        changed = self.vector_state.propagate(steps)
+        # Every belief may have moved - refresh all status entries at once
+        for aid, agent in self.agents.items():
+            self._status_entries[aid] = self._build_status_entry(aid, agent)
+        self.status_version += 1
+        self.metrics.set_distribution(
+            np.rint(np.round(self.vector_state.belief, 3) * 1000).sum(),
+            self.vector_state.risk_histogram()
+        )
+        
+        result = {
+            'steps': steps,
+            'risk_changes': [self.vector_state.village_ids[i] for i in changed],
+            'risk_distribution': self.vector_state.risk_histogram()
+        }
+        self.events.publish("network_update", result)
+        return result
+    
+    def record_reports(self, reports: List[Dict]) -> Dict:
+        """
+        Ingest a batch of symptom reports (vectorized mode).
+        
+        Each report is {'village_id', 'symptoms', 'metadata'}. Agents'
+        histories are appended, the array windows updated in one call,
+        then beliefs, status entries and metrics are refreshed once for
+        the whole batch via propagate_beliefs().
+        """
+        if self.vector_state is None:
+            raise RuntimeError("record_reports() requires vectorized=True")
+        
+        indices, anomalies, unknown = [], [], []
+        for report in reports:
+            resolved_id = self._resolve_village_id(report.get('village_id', ''))
+            if not resolved_id:
+                unknown.append(report.get('village_id'))
+                continue
+            agent = self.agents[resolved_id]
+            symptoms = report.get('symptoms', [])
+            analysis = agent.analyze_symptoms(symptoms)
+            agent.symptom_history.append(symptoms, analysis, report.get('metadata', {}))
+            indices.append(self.vector_state.index[resolved_id])
+            anomalies.append(analysis['anomaly_detected'])
+        
+        self.vector_state.record_reports(np.array(indices, dtype=np.int64),
+                                         np.array(anomalies, dtype=bool))
+        self.metrics.record_report(len(indices))
+        
+        return {
+            **self.propagate_beliefs(),
+            'reports_recorded': len(indices),
+            'unknown_villages': unknown
+        }
     
     def _log_communication(self, from_agent: str, to_agent: str, msg_type: str, content: Dict):
         """Log inter-agent communication for frontend visibility."""
-        self.communication_log.append({
-            "timestamp": datetime.now().isoformat(),
-            "from": from_agent,
-            "to": to_agent,
-            "type": msg_type,
-            "content": content
+        logged = len(self.communication_log)
+        entry = self.communication_log.append(from_agent, to_agent, msg_type, content)
+        if len(self.communication_log) != logged:
+            # 'recent_communications' in the status only moves until the ring fills
+            self.status_version += 1
+        self.events.publish("communication", entry, event_id=entry["seq"])
+    
+    def notify_agent_update(self, agent, previous_belief: float, previous_risk: str):
+        """Called by an agent after processing a report; publishes its delta."""
+        self._status_entries[agent.village_id] = self._build_status_entry(agent.village_id, agent)
+        self.status_version += 1
+        self.metrics.record_report()
+        self.metrics.update_village(previous_belief, agent.outbreak_belief,
+                                    previous_risk, agent.risk_level)
+        
+        self.events.publish("agent_update", {
+            "village_id": agent.village_id,
+            "name": agent.village_name,
+            "outbreak_belief": round(agent.outbreak_belief, 3),
+            "belief_delta": round(agent.outbreak_belief - previous_belief, 3),
+            "risk_level": agent.risk_level,
+            "previous_risk_level": previous_risk,
+            "symptom_count": agent.symptom_history.total_count
         })
-        # Keep only last 100 messages
-        if len(self.communication_log) > 100:
-            self.communication_log = self.communication_log[-100:]
 
-    def _resolve_village_id(self, village_id: str) -> str:
-        """Resolve village name to ID (accepts both 'Dharavi' and 'v1')."""
-        if village_id in self.agents:
-            return village_id
+    # ========================================================================
+    # AGENT REGISTRY (name/alias index)
+    # ========================================================================
+    
+    def register_agent(self, agent, neighbors: List[str] = None):
+        """
+        Add an agent and index its id, name and aliases.
         
-        # Match by name (case-insensitive)
-        village_lower = village_id.lower().replace(' ', '_')
-        for aid, agent in self.agents.items():
-            if agent.village_name.lower().replace(' ', '_') == village_lower:
-                return aid
-            if agent.village_name.lower() == village_id.lower():
-                return aid
+        Registering an id that already exists replaces that agent in place
+        and keeps its topology edges. `neighbors`, if given, replaces the
+        village's edges (both directions).
+        """
+        if self.vector_state is not None:
+            raise RuntimeError("Vectorized swarm membership is fixed at startup")
         
-        return None
+        village_id = agent.village_id
+        keys = {_index_key(name) for name in [village_id, agent.village_name, *agent.aliases]}
+        for key in keys:
+            owner = self._name_index.get(key)
+            if owner is not None and owner != village_id:
+                raise ValueError(f"Name '{key}' already belongs to village {owner}")
+        
+        previous = self.agents.get(village_id)
+        if previous is not None:
+            self.metrics.remove_village(previous.outbreak_belief, previous.risk_level,
+                                        previous.symptom_history.total_count)
+            for key in self._index_keys_by_agent.pop(village_id, set()):
+                if self._name_index.get(key) == village_id:
+                    del self._name_index[key]
+        
+        self.agents[village_id] = agent
+        self._index_keys_by_agent[village_id] = set()
+        for key in keys:
+            self.add_alias(key, village_id)
+        
+        if neighbors is not None:
+            self._set_neighbors(village_id, neighbors)
+        
+        self._status_entries[village_id] = self._build_status_entry(village_id, agent)
+        self._topology_changed()
+        self.metrics.add_village(agent.outbreak_belief, agent.risk_level,
+                                 agent.symptom_history.total_count)
+    
+    def _set_neighbors(self, village_id: str, neighbors: List[str]):
+        """Replace a village's edges, keeping the adjacency lists symmetric."""
+        old = set(self.network_topology.get(village_id, []))
+        new = [nid for nid in dict.fromkeys(neighbors) if nid != village_id]
+        self.network_topology[village_id] = new
+        
+        for neighbor_id in old - set(new):
+            edges = self.network_topology.get(neighbor_id, [])
+            if village_id in edges:
+                edges.remove(village_id)
+            neighbor = self.agents.get(neighbor_id)
+            if neighbor:
+                neighbor.belief_engine.remove_neighbor(village_id)
+                self._status_entries[neighbor_id] = self._build_status_entry(neighbor_id, neighbor)
+        
+        for neighbor_id in new:
+            edges = self.network_topology.setdefault(neighbor_id, [])
+            if village_id not in edges:
+                edges.append(village_id)
+            neighbor = self.agents.get(neighbor_id)
+            if neighbor and neighbor_id not in old:
+                self._status_entries[neighbor_id] = self._build_status_entry(neighbor_id, neighbor)
+        
+        agent = self.agents.get(village_id)
+        if agent:
+            for neighbor_id in old - set(new):
+                agent.belief_engine.remove_neighbor(neighbor_id)
+    
+    def unregister_agent(self, village_id: str):
+        """Remove an agent, its index entries and its topology edges."""
+        if self.vector_state is not None:
+            raise RuntimeError("Vectorized swarm membership is fixed at startup")
+        
+        agent = self.agents.pop(village_id, None)
+        if agent is None:
+            return
+        self._status_entries.pop(village_id, None)
+        self.metrics.remove_village(agent.outbreak_belief, agent.risk_level,
+                                    agent.symptom_history.total_count)
+        
+        for key in self._index_keys_by_agent.pop(village_id, set()):
+            if self._name_index.get(key) == village_id:
+                del self._name_index[key]
+        
+        for neighbor_id in self.network_topology.pop(village_id, []):
+            neighbors = self.network_topology.get(neighbor_id, [])
+            if village_id in neighbors:
+                neighbors.remove(village_id)
+            neighbor = self.agents.get(neighbor_id)
+            if neighbor:
+                neighbor.belief_engine.remove_neighbor(village_id)
+                self._status_entries[neighbor_id] = self._build_status_entry(neighbor_id, neighbor)
+        
+        self._topology_changed()
+    
+    def add_alias(self, alias: str, village_id: str):
+        """
+        Map an extra spelling (e.g. local-language name) to a village.
+        Raises ValueError if the name already belongs to another village.
+        """
+        if village_id not in self.agents:
+            raise KeyError(f"Unknown village: {village_id}")
+        
+        key = _index_key(alias)
+        owner = self._name_index.get(key)
+        if owner is not None and owner != village_id:
+            raise ValueError(f"Name '{alias}' already belongs to village {owner}")
+        self._name_index[key] = village_id
+        self._index_keys_by_agent[village_id].add(key)
+    
+    def _resolve_village_id(self, village_id: str) -> str:
+        """Resolve village id, name or alias to ID ('Dharavi', 'धारावी', 'v1')."""
+        return self._name_index.get(_index_key(village_id))
     
     async def process_symptom_report(self, village_id: str, symptoms: List[str], metadata: Dict) -> Dict:
         """Process symptom report through the appropriate agent."""
@@ -147,48 +393,94 @@ class SwarmOrchestrator:
         agent = self.agents[resolved_id]
         return await agent.receive_query(query_type, context)
     
+    async def _request_vote(self, agent, proposal: Dict) -> Dict:
+        """Ask a single agent for its vote (awaitable so remote agents fit)."""
+        return agent.vote_on_proposal(proposal)
+    
     async def collect_votes(self, proposal: Dict, voters: List[str]) -> Dict:
-        """Collect votes from agents using simple threshold logic."""
-        votes = {}
-        
+        """
+        Collect votes from agents using simple threshold logic.
+        Voters are polled concurrently; voters that fail or miss the
+        deadline are left out of the result.
+        """
+        voter_agents = {}
         for voter_id in voters:
             resolved_id = self._resolve_village_id(voter_id)
             if resolved_id and resolved_id in self.agents:
-                agent = self.agents[resolved_id]
-                vote_result = agent.vote_on_proposal(proposal)
-                votes[voter_id] = vote_result
-                
-                # Log the vote
-                self._log_communication(
-                    agent.village_name, proposal.get('proposer', 'unknown'),
-                    "vote",
-                    vote_result
-                )
+                voter_agents[voter_id] = self.agents[resolved_id]
+        
+        votes, _ = await gather_with_timeout(
+            {
+                voter_id: self._request_vote(agent, proposal)
+                for voter_id, agent in voter_agents.items()
+            },
+            timeout=self.query_timeout
+        )
+        
+        # Log the votes
+        for voter_id, vote_result in votes.items():
+            self._log_communication(
+                voter_agents[voter_id].village_name, proposal.get('proposer', 'unknown'),
+                "vote",
+                vote_result
+            )
         
         return votes
     
-    def get_communication_log(self, limit: int = 50) -> List[Dict]:
-        """Get recent communication log for frontend."""
-        return self.communication_log[-limit:]
+    def get_communication_log(self, limit: int = 50, since: int = None) -> List[Dict]:
+        """
+        Get recent communication log for frontend.
+        With `since`, return only entries after that sequence number.
+        """
+        if since is not None:
+            return self.communication_log.since(since, limit)
+        return self.communication_log.recent(limit)
     
-    def get_network_status(self) -> Dict:
-        """Get status of entire swarm network."""
-        return {
-            'total_agents': len(self.agents),
-            'network_topology': self.network_topology,
-            'agents': {
-                aid: {
-                    'name': agent.village_name,
-                    'location': agent.location,
-                    'outbreak_belief': round(agent.outbreak_belief, 3),
-                    'risk_level': agent.risk_level,
-                    'symptom_count': len(agent.symptom_history),
-                    'neighbors': self.network_topology.get(aid, [])
-                }
-                for aid, agent in self.agents.items()
-            },
-            'recent_communications': len(self.communication_log)
-        }
+    # ========================================================================
+    # NETWORK STATUS SNAPSHOT
+    # ========================================================================
+    
+    def _build_status_entry(self, village_id: str, agent) -> Mapping:
+        """Read-only status entry for one agent."""
+        return MappingProxyType({
+            'name': agent.village_name,
+            'location': agent.location,
+            'outbreak_belief': round(agent.outbreak_belief, 3),
+            'risk_level': agent.risk_level,
+            'symptom_count': agent.symptom_history.total_count,
+            'neighbors': tuple(self.network_topology.get(village_id, []))
+        })
+    
+    def _topology_changed(self):
+        self._frozen_topology = None
+        self.status_version += 1
+    
+    @property
+    def status_etag(self) -> str:
+        """Weak ETag of the current network status version."""
+        return f'W/"{self._status_instance}-{self.status_version}"'
+    
+    def get_network_status(self) -> Mapping:
+        """
+        Get status of entire swarm network.
+        
+        Returns a cached, read-only snapshot that is only rebuilt after an
+        agent, the topology or the communication count has changed.
+        """
+        if self._snapshot_version != self.status_version:
+            if self._frozen_topology is None:
+                self._frozen_topology = MappingProxyType({
+                    aid: tuple(neighbors) for aid, neighbors in self.network_topology.items()
+                })
+            self._status_snapshot = MappingProxyType({
+                'version': self.status_version,
+                'total_agents': len(self.agents),
+                'network_topology': self._frozen_topology,
+                'agents': MappingProxyType(dict(self._status_entries)),
+                'recent_communications': len(self.communication_log)
+            })
+            self._snapshot_version = self.status_version
+        return self._status_snapshot
     
     def get_agent(self, village_id: str):
         """Get specific agent."""
@@ -220,7 +512,7 @@ class SwarmOrchestrator:
                 "village": agent.village_name,
                 "belief": agent.outbreak_belief,
                 "risk_level": agent.risk_level,
-                "symptom_count": len(agent.symptom_history)
+                "symptom_count": agent.symptom_history.total_count
             }
             
             # Log belief sharing
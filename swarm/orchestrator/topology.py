@@ -0,0 +1,195 @@
+"""
+Swarm Topology Loader
+
+Builds village agent configs and the neighbor graph from
+config/swarm_config.yaml and/or a bulk CSV/Parquet village registry.
+
+Villages without an explicit `neighbors` list get neighbors computed
+from their coordinates with a KD-tree (k-nearest or radius search),
+so large registries need no hand-written adjacency lists.
+"""
+
+from typing import Dict, List, Tuple
+import csv
+import numpy as np
+
+from swarm.agents.agent_config import AgentConfig, VILLAGE_CONFIGS
+from swarm.utils.config_loader import CONFIG_DIR
+
+EARTH_RADIUS_KM = 6371.0
+
+
+# ============================================================================
+# REGISTRY LOADING
+# ============================================================================
+
+def _split_list(value) -> List[str]:
+    """Parse a ';'-separated registry cell into a list."""
+    # Sequences first: `value != value` is elementwise on arrays (parquet lists)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(v) for v in value]
+    if value is None or value != value:  # None or NaN
+        return []
+    return [v.strip() for v in str(value).split(';') if v.strip()]
+
+
+def read_registry(path: str) -> Dict[str, Dict]:
+    """
+    Read a village registry file (.csv or .parquet).
+
+    Columns: village_id, village_name, lat, lon, population,
+    optional aliases and neighbors (';'-separated).
+    Returns entries in the same shape as swarm_config.yaml `topology`.
+    """
+    if path.endswith('.parquet'):
+        import pandas as pd
+        rows = pd.read_parquet(path).to_dict('records')
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+
+    villages = {}
+    for row in rows:
+        entry = {
+            'name': row.get('village_name') or row.get('name'),
+            'location': [float(row['lat']), float(row['lon'])],
+            'population': int(float(row.get('population') or 0)),
+            'aliases': _split_list(row.get('aliases'))
+        }
+        neighbors = _split_list(row.get('neighbors'))
+        if neighbors:
+            entry['neighbors'] = neighbors
+        villages[str(row['village_id'])] = entry
+
+    return villages
+
+
+def load_villages(swarm_config: Dict) -> Tuple[Dict[str, AgentConfig], Dict[str, List[str]]]:
+    """
+    Build AgentConfigs from the `swarm:` section (topology + registry).
+
+    Returns (configs, explicit_neighbors) - the latter only for villages
+    that list `neighbors` themselves.
+    """
+    swarm = swarm_config.get('swarm', {})
+    behavior = swarm.get('behavior', {})
+    privacy = swarm.get('privacy', {})
+
+    villages = dict(swarm.get('topology') or {})
+    if swarm.get('registry'):
+        # Relative registry paths are resolved from the project root
+        villages.update(read_registry(str(CONFIG_DIR.parent / swarm['registry'])))
+
+    configs, explicit = {}, {}
+    for vid, entry in villages.items():
+        if 'neighbors' in entry:
+            explicit[vid] = list(entry['neighbors'])
+        configs[vid] = AgentConfig(
+            village_id=vid,
+            village_name=entry.get('name', vid),
+            location=tuple(entry['location']),
+            population=entry.get('population', 0),
+            aliases=list(entry.get('aliases', [])),
+            anomaly_threshold=behavior.get('anomaly_threshold', 2.0),
+            auto_query_neighbors=behavior.get('query_neighbors_on_anomaly', True),
+            auto_escalate_on_consensus=behavior.get('auto_escalate_on_consensus', True),
+            consensus_threshold=behavior.get('consensus_threshold', 0.66),
+            anonymize_data=privacy.get('anonymize_data', True),
+            share_only_aggregated=privacy.get('share_aggregated_only', True)
+        )
+
+    return configs, explicit
+
+
+# ============================================================================
+# SPATIAL NEIGHBOR COMPUTATION
+# ============================================================================
+
+def _to_unit_vectors(locations: np.ndarray) -> np.ndarray:
+    """(lat, lon) degrees -> 3D unit vectors, so Euclidean = chord distance."""
+    lat = np.radians(locations[:, 0])
+    lon = np.radians(locations[:, 1])
+    return np.column_stack([
+        np.cos(lat) * np.cos(lon),
+        np.cos(lat) * np.sin(lon),
+        np.sin(lat)
+    ])
+
+
+def compute_neighbors(locations: np.ndarray, method: str = 'knn',
+                      k: int = 3, radius_km: float = 15.0) -> List[List[int]]:
+    """
+    Neighbor indices per village from coordinates via a KD-tree.
+
+    Args:
+        locations: [N, 2] array of (lat, lon) degrees
+        method: 'knn' (k nearest) or 'radius' (all within radius_km)
+    """
+    from scipy.spatial import cKDTree
+
+    if method != 'radius' and k < 0:
+        raise ValueError(f"k must be >= 0, got {k}")
+
+    n = len(locations)
+    if n < 2 or (method != 'radius' and k == 0):
+        return [[] for _ in range(n)]
+
+    points = _to_unit_vectors(np.asarray(locations, dtype=np.float64))
+    tree = cKDTree(points)
+
+    if method == 'radius':
+        chord = 2.0 * np.sin(radius_km / (2.0 * EARTH_RADIUS_KM))
+        groups = tree.query_ball_point(points, r=chord)
+        return [[j for j in group if j != i] for i, group in enumerate(groups)]
+
+    # k + 1 because each point is its own nearest neighbor
+    _, idx = tree.query(points, k=min(k + 1, n))
+    return [[int(j) for j in row if j != i] for i, row in enumerate(idx)]
+
+
+def build_topology(configs: Dict[str, AgentConfig], explicit: Dict[str, List[str]],
+                   method: str = 'knn', k: int = 3,
+                   radius_km: float = 15.0) -> Dict[str, List[str]]:
+    """
+    Undirected neighbor graph: explicit lists are kept, villages without
+    one get spatially computed neighbors, then every edge is mirrored.
+    """
+    ids = list(configs.keys())
+    topology = {vid: [n for n in explicit.get(vid, []) if n in configs] for vid in ids}
+
+    missing = [vid for vid in ids if vid not in explicit]
+    if missing:
+        locations = np.array([configs[vid].location for vid in ids], dtype=np.float64)
+        computed = compute_neighbors(locations, method=method, k=k, radius_km=radius_km)
+        position = {vid: i for i, vid in enumerate(ids)}
+        for vid in missing:
+            topology[vid] = [ids[j] for j in computed[position[vid]]]
+
+    # Mirror edges so the graph is undirected
+    neighbor_sets = {vid: set(neighbors) for vid, neighbors in topology.items()}
+    for vid, neighbors in topology.items():
+        for nid in neighbors:
+            if vid not in neighbor_sets[nid]:
+                neighbor_sets[nid].add(vid)
+                topology[nid].append(vid)
+
+    return topology
+
+
+def load_swarm_topology(swarm_config: Dict) -> Tuple[Dict[str, AgentConfig], Dict[str, List[str]]]:
+    """
+    Village configs and undirected topology from swarm_config.yaml.
+    Falls back to the built-in VILLAGE_CONFIGS when no villages are configured.
+    """
+    configs, explicit = load_villages(swarm_config)
+    if not configs:
+        configs, explicit = dict(VILLAGE_CONFIGS), {}
+
+    settings = swarm_config.get('swarm', {}).get('neighbors', {})
+    topology = build_topology(
+        configs, explicit,
+        method=settings.get('method', 'knn'),
+        k=settings.get('k', 3),
+        radius_km=settings.get('radius_km', 15.0)
+    )
+    return configs, topology
@@ -0,0 +1,181 @@
+"""
+Vectorized Swarm State (Array-Backed Belief Engine)
+
+Keeps every village's belief, risk level and anomaly window in NumPy
+arrays, with the network topology as a sparse adjacency matrix.
+A whole-network belief propagation step is a single batched
+sparse matrix-vector product plus threshold lookup.
+
+Per-agent objects (VillageSwarmAgent) become thin views over one row
+of these arrays - see VillageSwarmAgent.bind_state().
+
+NO LLM - same weighted formula as BeliefEngine, applied to all rows.
+"""
+
+from typing import Dict, List, Sequence
+import numpy as np
+from scipy import sparse
+
+# Risk levels by code; thresholds mirror VillageSwarmAgent._update_risk_level
+RISK_LEVELS = ('normal', 'low', 'medium', 'high', 'critical')
+RISK_THRESHOLDS = np.array([0.2, 0.4, 0.6, 0.8])
+RISK_CODES = {name: code for code, name in enumerate(RISK_LEVELS)}
+
+
+def risk_codes_for(beliefs: np.ndarray) -> np.ndarray:
+    """Map beliefs to risk level codes (belief >= threshold -> next level)."""
+    return np.digitize(beliefs, RISK_THRESHOLDS).astype(np.uint8)
+
+
+class VectorizedSwarmState:
+    """
+    Array-backed state for N villages.
+
+    Arrays (length N unless noted):
+        belief          float64 outbreak belief
+        risk            uint8 risk level code (index into RISK_LEVELS)
+        report_count    int64 reports ever received
+        anomaly_window  bool [N, window] ring of recent anomaly flags
+        anomaly_count   int64 anomalies inside the window
+        adjacency       CSR [N, N] neighbor matrix
+    """
+
+    def __init__(self, village_ids: Sequence[str], topology: Dict[str, List[str]],
+                 window: int = 5, history_weight=0.4, anomaly_weight=0.4,
+                 neighbor_weight=0.2, history_saturation=10):
+        self.village_ids: List[str] = list(village_ids)
+        self.index: Dict[str, int] = {vid: i for i, vid in enumerate(self.village_ids)}
+        n = len(self.village_ids)
+        self.window = window
+
+        self.belief = np.zeros(n, dtype=np.float64)
+        self.risk = np.zeros(n, dtype=np.uint8)
+        self.report_count = np.zeros(n, dtype=np.int64)
+        self.anomaly_window = np.zeros((n, window), dtype=bool)
+        self.anomaly_count = np.zeros(n, dtype=np.int64)
+
+        # Formula weights - scalars broadcast, or per-village arrays
+        self.history_weight = np.broadcast_to(np.asarray(history_weight, dtype=np.float64), (n,))
+        self.anomaly_weight = np.broadcast_to(np.asarray(anomaly_weight, dtype=np.float64), (n,))
+        self.neighbor_weight = np.broadcast_to(np.asarray(neighbor_weight, dtype=np.float64), (n,))
+        self.history_saturation = np.broadcast_to(
+            np.asarray(history_saturation, dtype=np.float64), (n,)
+        )
+
+        self.set_topology(topology)
+
+    @classmethod
+    def from_agents(cls, agents: Dict, topology: Dict[str, List[str]]) -> "VectorizedSwarmState":
+        """Build state from existing agents and bind each agent to its row."""
+        engines = [agent.belief_engine for agent in agents.values()]
+        windows = {e.anomaly_window for e in engines}
+        if len(windows) > 1:
+            raise ValueError(f"Vectorized mode needs a single anomaly window, got {sorted(windows)}")
+
+        state = cls(
+            list(agents.keys()), topology,
+            window=windows.pop() if windows else 5,
+            history_weight=[e.history_weight for e in engines],
+            anomaly_weight=[e.anomaly_weight for e in engines],
+            neighbor_weight=[e.neighbor_weight for e in engines],
+            history_saturation=[e.history_saturation for e in engines]
+        )
+        for aid, agent in agents.items():
+            agent.bind_state(state, state.index[aid])
+        return state
+
+    def set_topology(self, topology: Dict[str, List[str]]):
+        """Rebuild the sparse adjacency matrix from an adjacency list."""
+        n = len(self.village_ids)
+        rows, cols = [], []
+        for vid, neighbors in topology.items():
+            i = self.index.get(vid)
+            if i is None:
+                continue
+            for nid in neighbors:
+                j = self.index.get(nid)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+
+        self.adjacency = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(n, n)
+        )
+        self.degree = np.asarray(self.adjacency.sum(axis=1)).ravel()
+
+    # ========================================================================
+    # REPORT INGESTION
+    # ========================================================================
+
+    def record_report(self, i: int, anomaly: bool):
+        """Record a single report for village row `i`."""
+        slot = self.report_count[i] % self.window
+        self.anomaly_count[i] += int(anomaly) - int(self.anomaly_window[i, slot])
+        self.anomaly_window[i, slot] = anomaly
+        self.report_count[i] += 1
+
+    def record_reports(self, indices: np.ndarray, anomalies: np.ndarray):
+        """
+        Record a batch of reports (rows may repeat).
+
+        Reports are applied in order; only the last `window` reports per
+        village can affect its window, so earlier ones just add to counts.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        anomalies = np.asarray(anomalies, dtype=bool)
+        if indices.size == 0:
+            return
+
+        # Ordinal of each report within its village (stable -> keeps order)
+        order = np.argsort(indices, kind='stable')
+        sorted_idx = indices[order]
+        counts = np.bincount(sorted_idx, minlength=len(self.village_ids))
+        starts = np.cumsum(counts) - counts
+        rank = np.arange(indices.size) - starts[sorted_idx]
+
+        # Keep only reports that land inside the final window
+        keep = rank >= counts[sorted_idx] - self.window
+        rows = sorted_idx[keep]
+        slots = (self.report_count[rows] + rank[keep]) % self.window
+        self.anomaly_window[rows, slots] = anomalies[order][keep]
+
+        self.report_count += counts
+        touched = np.flatnonzero(counts)
+        self.anomaly_count[touched] = self.anomaly_window[touched].sum(axis=1)
+
+    # ========================================================================
+    # BATCHED BELIEF PROPAGATION
+    # ========================================================================
+
+    def neighbor_mean(self) -> np.ndarray:
+        """Average neighbor belief per village (0 for isolated villages)."""
+        totals = self.adjacency @ self.belief
+        return np.divide(totals, self.degree, out=np.zeros_like(totals),
+                         where=self.degree > 0)
+
+    def propagate(self, steps: int = 1) -> np.ndarray:
+        """
+        Run `steps` synchronous belief updates across the whole network.
+
+        Returns indices of villages whose risk level changed.
+        """
+        previous_risk = self.risk.copy()
+        history_factor = np.minimum(self.report_count / self.history_saturation, 1.0)
+        anomaly_factor = self.anomaly_count / float(self.window)
+        local = self.history_weight * history_factor + self.anomaly_weight * anomaly_factor
+
+        for _ in range(steps):
+            self.belief = local + self.neighbor_weight * self.neighbor_mean()
+
+        self.risk = risk_codes_for(self.belief)
+        return np.flatnonzero(self.risk != previous_risk)
+
+    def risk_level(self, i: int) -> str:
+        return RISK_LEVELS[self.risk[i]]
+
+    def set_risk_level(self, i: int, level: str):
+        self.risk[i] = RISK_CODES[level]
+
+    def risk_histogram(self) -> Dict[str, int]:
+        counts = np.bincount(self.risk, minlength=len(RISK_LEVELS))
+        return {name: int(counts[code]) for code, name in enumerate(RISK_LEVELS)}
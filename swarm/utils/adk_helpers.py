@@ -1,4 +1,5 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Awaitable, Tuple
+import asyncio
 import json
 
 def format_tool_result(tool_name: str, result: Any) -> Dict:
@@ -110,3 +111,31 @@ def calculate_network_health(agents: Dict) -> Dict:
         'total_agents': total_agents,
         'high_risk_count': high_risk
     }
+
+async def gather_with_timeout(calls: Dict[str, Awaitable], timeout: float) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Run keyed awaitables concurrently with a shared deadline.
+    
+    Returns (results, failed): results keeps the input key order and only
+    holds calls that completed successfully; failed lists keys that raised
+    or timed out. Stragglers still running at the deadline are cancelled.
+    """
+    tasks = {key: asyncio.ensure_future(call) for key, call in calls.items()}
+    if not tasks:
+        return {}, []
+    
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    results, failed = {}, []
+    for key, task in tasks.items():
+        if task in done and not task.cancelled() and task.exception() is None:
+            results[key] = task.result()
+        else:
+            failed.append(key)
+    
+    return results, failed
@@ -0,0 +1,44 @@
+"""
+Config Loader
+Reads YAML files from the project's config/ directory
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+import copy
+import yaml
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+
+
+@lru_cache(maxsize=None)
+def _parse_config(name: str) -> Dict:
+    """Parsed config/<name>.yaml, shared - callers must not mutate it."""
+    path = CONFIG_DIR / f"{name}.yaml"
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+def load_config(name: str) -> Dict:
+    """
+    Load config/<name>.yaml. The file is parsed once; each call returns
+    its own copy, so callers may modify it. Missing files yield an empty dict.
+    """
+    return copy.deepcopy(_parse_config(name))
+
+
+def get_adk_setting(key: str, default: Any = None) -> Any:
+    """
+    Look up a dotted key under `adk:` in adk_config.yaml.
+
+    Example: get_adk_setting('tools.timeout', 30)
+    """
+    node = _parse_config('adk_config').get('adk', {})
+    for part in key.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return default
+        node = node[part]
+    return copy.deepcopy(node)
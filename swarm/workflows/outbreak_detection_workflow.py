@@ -1,10 +1,19 @@
 """
 Outbreak Detection Workflow
 Defines the coordinated workflow for swarm agents
+
+Steps form a DAG via `depends_on` and are scheduled topologically:
+independent steps and per-agent actions run concurrently (bounded by
+adk.orchestration.max_concurrent_agents), each step is bounded by its
+`timeout`, and per-step wall-clock timings are reported.
 """
 
 from typing import Dict, List, Any
 from dataclasses import dataclass
+import asyncio
+import time
+
+from swarm.utils.config_loader import get_adk_setting
 
 @dataclass
 class WorkflowStep:
@@ -22,15 +31,19 @@ class WorkflowStep:
 class OutbreakDetectionWorkflow:
     """
     Multi-agent workflow for outbreak detection
-    Coordinates agent actions in sequence
+    Coordinates agent actions as a dependency graph of steps
     """
     
     name = "outbreak_detection"
     description = "Coordinated workflow for detecting disease outbreaks"
     
-    def __init__(self, orchestrator=None):
+    def __init__(self, orchestrator=None, max_concurrency: int = None):
         self.orchestrator = orchestrator
+        self.max_concurrency = max_concurrency or get_adk_setting(
+            'orchestration.max_concurrent_agents', 10
+        )
         self.steps = self._define_steps()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
     
     def _define_steps(self) -> List[WorkflowStep]:
         """Define workflow steps"""
@@ -48,6 +61,7 @@ class OutbreakDetectionWorkflow:
                 description="Agents query neighbors if anomaly detected",
                 agent_action="query_neighbors",
                 condition="anomaly_detected == true",
+                depends_on=["local_analysis"],
                 parallel=True,
                 timeout=60
             ),
@@ -66,6 +80,7 @@ class OutbreakDetectionWorkflow:
                 description="Agent with strongest evidence proposes action",
                 agent_action="propose_consensus",
                 agent_selector="max_outbreak_belief",
+                depends_on=["collective_reasoning"],
                 timeout=30
             ),
             
@@ -84,13 +99,46 @@ class OutbreakDetectionWorkflow:
                 agent_action="escalate_to_quantum",
                 condition="consensus_reached == true",
                 agent_selector="proposer",
+                depends_on=["voting"],
                 timeout=120
             )
         ]
     
+    def _topological_order(self) -> List[WorkflowStep]:
+        """Order steps so dependencies come first (Kahn's algorithm)."""
+        by_name = {step.name: step for step in self.steps}
+        indegree = {}
+        dependents: Dict[str, List[str]] = {name: [] for name in by_name}
+        
+        for step in self.steps:
+            deps = step.depends_on or []
+            for dep in deps:
+                if dep not in by_name:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+                dependents[dep].append(step.name)
+            indegree[step.name] = len(deps)
+        
+        ready = [name for name in by_name if indegree[name] == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(by_name[name])
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        
+        if len(order) != len(self.steps):
+            raise ValueError("Workflow steps contain a dependency cycle")
+        return order
+    
     async def execute(self, trigger_data: Dict) -> Dict:
         """
         Execute the workflow
+        
+        Every step whose dependencies have finished is started at once.
+        A failed step causes its dependents to be skipped; independent
+        branches keep running.
         """
         if not self.orchestrator:
             return {"error": "Orchestrator not configured"}
@@ -98,25 +146,82 @@ class OutbreakDetectionWorkflow:
         results = {
             "workflow": self.name,
             "trigger_data": trigger_data,
-            "step_results": {}
+            "step_results": {},
+            "timings": {}
         }
         
-        # Execute each step
-        for step in self.steps:
-            try:
-                step_result = await self._execute_step(step, results)
-                results["step_results"][step.name] = step_result
+        try:
+            order = self._topological_order()
+        except ValueError as e:
+            results["error"] = str(e)
+            return results
+        
+        workflow_start = time.perf_counter()
+        
+        waiting = list(order)
+        running: Dict[asyncio.Task, WorkflowStep] = {}
+        failed = set()
+        
+        try:
+            while waiting or running:
+                # Launch every step whose dependencies are all finished
+                for step in list(waiting):
+                    deps = step.depends_on or []
+                    if not all(dep in results["step_results"] for dep in deps):
+                        continue
+                    waiting.remove(step)
+                    
+                    failed_deps = [dep for dep in deps if dep in failed]
+                    if failed_deps:
+                        results["step_results"][step.name] = {
+                            "skipped": True,
+                            "reason": f"Dependency failed: {', '.join(failed_deps)}"
+                        }
+                        failed.add(step.name)
+                        continue
+                    
+                    task = asyncio.ensure_future(
+                        self._run_timed_step(step, results, workflow_start)
+                    )
+                    running[task] = step
                 
-                # Check if we should continue
-                if not self._should_continue(step, step_result):
-                    break
+                if not running:
+                    continue
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    step_result = task.result()
+                    results["step_results"][step.name] = step_result
                     
-            except Exception as e:
-                results["step_results"][step.name] = {"error": str(e)}
-                break
+                    if not self._should_continue(step, step_result):
+                        failed.add(step.name)
+        finally:
+            for task in running:
+                task.cancel()
         
+        results["total_duration_ms"] = round((time.perf_counter() - workflow_start) * 1000, 2)
         return results
     
+    async def _run_timed_step(self, step: WorkflowStep, context: Dict, workflow_start: float) -> Dict:
+        """Run a step under its timeout and record wall-clock timing."""
+        started = time.perf_counter()
+        try:
+            step_result = await asyncio.wait_for(
+                self._execute_step(step, context), timeout=step.timeout
+            )
+        except asyncio.TimeoutError:
+            step_result = {"error": f"Step timed out after {step.timeout}s"}
+        except Exception as e:
+            step_result = {"error": str(e)}
+        finished = time.perf_counter()
+        
+        context["timings"][step.name] = {
+            "started_at_ms": round((started - workflow_start) * 1000, 2),
+            "duration_ms": round((finished - started) * 1000, 2)
+        }
+        return step_result
+    
     async def _execute_step(self, step: WorkflowStep, context: Dict) -> Dict:
         """Execute a single workflow step"""
         
@@ -135,14 +240,18 @@ class OutbreakDetectionWorkflow:
         
         # Execute action
         if step.parallel:
-            # Execute on all agents in parallel
+            # Execute on all agents concurrently (bounded)
+            outcomes = await asyncio.gather(
+                *(self._bounded_agent_action(agent, step.agent_action, context)
+                  for agent in agents.values()),
+                return_exceptions=True
+            )
             results = {}
-            for agent_id, agent in agents.items():
-                try:
-                    result = await self._execute_agent_action(agent, step.agent_action, context)
-                    results[agent_id] = result
-                except Exception as e:
-                    results[agent_id] = {"error": str(e)}
+            for agent_id, outcome in zip(agents.keys(), outcomes):
+                if isinstance(outcome, Exception):
+                    results[agent_id] = {"error": str(outcome)}
+                else:
+                    results[agent_id] = outcome
             return {"parallel_results": results}
         else:
             # Execute on selected agent
@@ -151,6 +260,11 @@ class OutbreakDetectionWorkflow:
                 return await self._execute_agent_action(agent, step.agent_action, context)
             return {"error": "No agent selected"}
     
+    async def _bounded_agent_action(self, agent, action: str, context: Dict) -> Dict:
+        """Run an agent action under the workflow-wide concurrency limit."""
+        async with self._semaphore:
+            return await self._execute_agent_action(agent, action, context)
+    
     def _select_agents(self, step: WorkflowStep) -> Dict:
         """Select agents for the step"""
         if not self.orchestrator:
@@ -11,6 +11,29 @@ from backend.app.services.quantum_service import QuantumService
 quantum_service = QuantumService()
 print("✓ Quantum service initialized")
 
+print("\n1b. Cross-checking NumPy simulator backend against Cirq...")
+import numpy as np
+from quantum.simulators import NumpyBackend, CirqBackend
+rng = np.random.default_rng(0)
+num_qubits, batch = 8, 5
+ops = (
+    [('h', q) for q in range(num_qubits)]
+    + [('ry', q, rng.uniform(0, np.pi, batch)) for q in range(num_qubits)]
+    + [('cnot', q, q + 1) for q in range(num_qubits - 1)]
+    + [('rx', q, np.pi / 4) for q in range(num_qubits)]
+    + [('rz', q, rng.uniform(0, np.pi, batch)) for q in range(num_qubits)]
+    + [('cz', q, q + 1) for q in range(0, num_qubits - 1, 2)]
+)
+error = np.max(np.abs(
+    NumpyBackend().statevectors(num_qubits, ops) - CirqBackend().statevectors(num_qubits, ops)
+))
+assert error < 1e-5, f"NumPy backend differs from Cirq by {error}"
+print(f"✓ NumPy and Cirq statevectors agree (max error {error:.1e})")
+for backend in (NumpyBackend(), CirqBackend()):
+    first, second = (backend.sample(num_qubits, ops, 20, seed=7) for _ in range(2))
+    assert np.array_equal(first, second), f"{backend.name} backend sampling ignores seed"
+print("✓ Seeded sampling is reproducible on both backends")
+
 print("\n2. Testing edge AI service...")
 from backend.app.services.edge_ai_service import GeminiEdgeProcessor
 gemini_processor = GeminiEdgeProcessor(api_key="test-key")